@@ -0,0 +1,295 @@
+"""Micro-benchmarks for the hot paths of the app.
+
+Run all of them with `python benchmarks.py`, or pick some by name:
+`python benchmarks.py dataset`. `python benchmarks.py import` doubles as the
+cold-start check and exits non-zero when `import nuclear` is over budget.
+"""
+import sys
+import time
+
+
+def timeit(fn, repeat=50):
+    """Best-of-N wall time of fn() in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_dataset():
+    """Per-request CSV parse vs. the shared in-memory dataset store"""
+    import pandas as pd
+    from mapsfeature.datastore import CSV_PATH, get_dataset
+
+    get_dataset()  # first load is paid once per process
+    parse_ms = timeit(lambda: pd.read_csv(CSV_PATH))
+    store_ms = timeit(get_dataset)
+    print(f"pd.read_csv per request : {parse_ms:8.3f} ms")
+    print(f"get_dataset per request : {store_ms:8.3f} ms")
+
+
+def bench_geometry():
+    """Re-parsing the world GeoJSON per request vs. rendering the cached fragments"""
+    import json
+    from mapsfeature.geometry import GEOJSON_FILE, get_geometry
+
+    path = 'static/' + GEOJSON_FILE
+    geometry = get_geometry(path)
+    overlays = [{'count': 1, 'density': 'minimal', 'last_updated': ''}] * len(geometry)
+
+    def reparse():
+        with open(path, encoding='utf-8') as f:
+            countries = json.load(f)
+        for feature, overlay in zip(countries['features'], overlays):
+            feature['properties'].update(overlay)
+        return json.dumps(countries)
+
+    print(f"json.load + json.dumps  : {timeit(reparse, 10):8.3f} ms")
+    print(f"WorldGeometry.render    : {timeit(lambda: geometry.render(overlays, {}), 10):8.3f} ms")
+
+
+def bench_cube():
+    """DataFrame filtering vs. the precomputed (type, era, location) count cube"""
+    from mapsfeature.datastore import get_dataset
+    from mapsfeature.maproutes import filter_fossils
+
+    dataset = get_dataset()
+
+    def scan():
+        return filter_fossils(dataset, '', 'sauropod', 'jurassic')['lived_in_lower'].value_counts().to_dict()
+
+    print(f"DataFrame filter + count: {timeit(scan):8.3f} ms")
+    print(f"count cube lookup       : {timeit(lambda: dataset.location_counts('sauropod', 'jurassic')):8.3f} ms")
+
+
+def bench_search():
+    """str.contains over the name column vs. the trigram name index"""
+    from mapsfeature.datastore import get_dataset
+
+    dataset = get_dataset()
+    names = dataset.df['name_lower']
+    index = dataset.name_index
+
+    print(f"str.contains('saur')    : {timeit(lambda: names.str.contains('saur', regex=False)):8.3f} ms")
+    print(f"index.substring('saur') : {timeit(lambda: index.substring('saur')):8.3f} ms")
+    print(f"index.suggest('tyranno'): {timeit(lambda: index.suggest('tyranno')):8.3f} ms")
+
+
+def bench_predict(rows=100000):
+    """Scalar predict_dinosaur_impact in a loop vs. the vectorized batch path"""
+    import numpy as np
+    from nuclear import predict_dinosaur_impact, predict_dinosaur_impact_batch
+
+    rng = np.random.default_rng(0)
+    columns = {
+        'length': rng.uniform(1, 35, rows),
+        'height': rng.uniform(0.5, 12, rows),
+        'diet': rng.choice(['carnivorous', 'herbivorous', 'omnivorous', 'unknown'], rows),
+        'type': rng.choice(['sauropod', 'large theropod', 'small theropod', 'ceratopsian',
+                            'armoured dinosaur', 'euornithopod'], rows),
+        'period': rng.choice(['Late Triassic', 'Early Jurassic', 'Mid Jurassic', 'Late Jurassic',
+                              'Early Cretaceous', 'Late Cretaceous'], rows),
+        'start_time': np.full(rows, 100.0),
+        'end_time': np.full(rows, 90.0),
+    }
+    records = list(zip(*(columns[key].tolist() for key in
+                         ['length', 'height', 'diet', 'type', 'period', 'start_time', 'end_time'])))
+
+    scalar = []
+    scalar_ms = timeit(lambda: scalar.__setitem__(slice(None), [predict_dinosaur_impact(*r) for r in records]), 1)
+    batch_ms = timeit(lambda: predict_dinosaur_impact_batch(columns), 5)
+    batch = predict_dinosaur_impact_batch(columns)
+    mismatches = sum(
+        any(result[key] != batch[key][i] for key in result) for i, result in enumerate(scalar)
+    )
+    print(f"scalar loop ({rows} rows): {scalar_ms:8.1f} ms")
+    print(f"batch       ({rows} rows): {batch_ms:8.1f} ms")
+    print(f"mismatching rows         : {mismatches}")
+
+
+def bench_forest():
+    """sklearn RandomForestRegressor.predict vs. the compiled forest, per single row"""
+    import numpy as np
+    import pandas as pd
+    from nuclear import get_impact_model, load_model
+
+    impact_model = get_impact_model()
+    model = load_model()['model']
+
+    X = pd.DataFrame(
+        [impact_model.features(length, 'carnivorous', 'large theropod', 'Late Cretaceous', 68.0, 66.0)[0]
+         for length in np.linspace(1, 35, 200)],
+        columns=impact_model.feature_names
+    )
+    row = X.iloc[[0]]
+    x = X.to_numpy()[0]
+    sklearn_ms = timeit(lambda: model.predict(row), 20)
+    compiled_ms = timeit(lambda: impact_model.forest.predict_one(x), 200)
+    max_diff = float(np.abs(model.predict(X) - impact_model.forest.predict(X.to_numpy())).max())
+    print(f"model.predict (1 row)   : {sklearn_ms * 1000:8.1f} us")
+    print(f"forest.predict_one      : {compiled_ms * 1000:8.1f} us")
+    print(f"max |difference| (200)  : {max_diff:.2e}")
+
+
+MODEL_STARTUP_SCRIPT = '''
+import time
+start = time.perf_counter()
+if {mmap}:
+    from modelfeature.artifact import load_artifact
+    model = load_artifact()
+else:
+    import pickle
+    from modelfeature.forest import ImpactModel
+    with open('dinosaur_impact_predictor.pkl', 'rb') as f:
+        model = ImpactModel.from_pickle_data(pickle.load(f))
+model.predict(12.0, 'carnivorous', 'large theropod', 'Late Cretaceous', 68.0, 66.0)
+elapsed = (time.perf_counter() - start) * 1000
+with open('/proc/self/status') as f:
+    status = dict(line.split(':', 1) for line in f)
+print(elapsed, int(status['RssAnon'].split()[0]), int(status['RssFile'].split()[0]))
+'''
+
+
+def bench_model_artifact():
+    """Worker startup with the pickle vs. the memory-mapped artifact (fresh process each; RSS needs Linux /proc)"""
+    import subprocess
+
+    for label, mmap in (('pickle', False), ('mmap artifact', True)):
+        runs = [
+            subprocess.run([sys.executable, '-W', 'ignore', '-c', MODEL_STARTUP_SCRIPT.format(mmap=mmap)],
+                           capture_output=True, text=True, check=True).stdout.split()
+            for _ in range(5)
+        ]
+        load_ms = min(float(run[0]) for run in runs)
+        anon_kb, file_kb = (int(value) for value in runs[-1][1:])
+        print(f"{label:<14} load+predict {load_ms:8.1f} ms, private RSS {anon_kb / 1024:6.1f} MB, "
+              f"shared file RSS {file_kb / 1024:6.1f} MB")
+
+
+# Cold-start budget for a bare `import nuclear` (Flask itself is most of it), and the
+# modules that must stay unloaded until a request needs them
+IMPORT_BUDGET_MS = 300
+DEFERRED_MODULES = ['numpy', 'pandas', 'sklearn', 'requests']
+
+IMPORT_SCRIPT = '''
+import sys
+import time
+start = time.perf_counter()
+import nuclear
+elapsed = (time.perf_counter() - start) * 1000
+print(elapsed, *[name for name in {deferred!r} if name in sys.modules])
+'''
+
+
+def bench_import():
+    """Fresh-process `import nuclear` time; exits non-zero when over IMPORT_BUDGET_MS or a heavy module loads eagerly"""
+    import subprocess
+
+    runs = [
+        subprocess.run([sys.executable, '-c', IMPORT_SCRIPT.format(deferred=DEFERRED_MODULES)],
+                       capture_output=True, text=True, check=True).stdout.split()
+        for _ in range(5)
+    ]
+    import_ms = min(float(run[0]) for run in runs)
+    eager = sorted({name for run in runs for name in run[1:]})
+    print(f"import nuclear          : {import_ms:8.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"eagerly imported        : {', '.join(eager) or 'none'}")
+    if import_ms > IMPORT_BUDGET_MS or eager:
+        sys.exit("import budget exceeded")
+
+
+def _synthetic_csv(path, rows):
+    """The fossil CSV repeated to `rows` records, with distinct names so the name dictionary grows too"""
+    from mapsfeature.datastore import CSV_PATH
+
+    with open(CSV_PATH, encoding='utf-8') as f:
+        header, *records = f.read().splitlines()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header + '\n')
+        for i in range(rows):
+            # name is the second to last column
+            head, name, category = records[i % len(records)].rsplit(',', 2)
+            f.write(f"{head},{name}-{i // len(records)},{category}\n")
+
+
+def bench_columnar():
+    """pd.read_csv vs. the memory-mapped columnar cache, at the real size and at 1M rows"""
+    import os
+    import tempfile
+    import pandas as pd
+    from mapsfeature.columnar import build_columnar, load_columnar
+    from mapsfeature.datastore import CSV_PATH
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, 'fossils_1m.csv')
+        _synthetic_csv(big, 1_000_000)
+        for path, repeat in ((CSV_PATH, 50), (big, 3)):
+            cache = os.path.join(tmp, os.path.basename(path) + '.columns')
+            build_columnar(path, cache)
+            rows = len(pd.read_csv(path))
+            assert load_columnar(path, cache).equals(pd.read_csv(path))
+            print(f"pd.read_csv ({rows:>7} rows) : {timeit(lambda: pd.read_csv(path), repeat):8.1f} ms")
+            print(f"load_columnar ({rows:>7} rows): {timeit(lambda: load_columnar(path, cache), repeat):8.1f} ms")
+
+
+def bench_counts_cache():
+    """country-fossil-counts rendered per request vs. served from the response cache"""
+    import logging
+    from nuclear import app
+    from mapsfeature.maproutes import counts_cache
+
+    logging.getLogger('maps').setLevel(logging.WARNING)
+    client = app.test_client()
+    for url in ('/maps/api/country-fossil-counts?group=sauropod&era=jurassic',
+                '/maps/api/country-fossil-counts?format=counts&group=sauropod&era=jurassic'):
+        client.get(url)  # dataset and geometry load
+
+        def uncached():
+            counts_cache.version = None  # the next lookup starts an empty cache
+            client.get(url)
+
+        label = url.split('?')[1][:22]
+        print(f"{label:<22} render   : {timeit(uncached, 5):8.2f} ms")
+        print(f"{label:<22} cached   : {timeit(lambda: client.get(url)):8.2f} ms")
+
+
+def bench_compression():
+    """Compression time and size per encoding and level on the two country-counts bodies"""
+    import logging
+    from nuclear import app
+    from httpcompress import ENCODINGS, compress
+
+    logging.getLogger('maps').setLevel(logging.WARNING)
+    client = app.test_client()
+    levels = {'gzip': (1, 6, 9), 'br': (1, 5, 11), 'zstd': (1, 3, 19)}
+    for url in ('/maps/api/country-fossil-counts', '/maps/api/country-fossil-counts?format=counts'):
+        body = client.get(url, headers={'Accept-Encoding': 'identity'}).get_data()
+        print(f"{url} ({len(body)} bytes)")
+        for encoding in ENCODINGS:
+            for level in levels[encoding]:
+                size = len(compress(body, encoding, level))
+                ms = timeit(lambda: compress(body, encoding, level), 3)
+                print(f"  {encoding:<4} {level:>2}: {ms:8.2f} ms {size:9d} bytes ({len(body) / size:5.1f}x)")
+
+
+BENCHMARKS = {
+    'dataset': bench_dataset,
+    'geometry': bench_geometry,
+    'cube': bench_cube,
+    'search': bench_search,
+    'predict': bench_predict,
+    'forest': bench_forest,
+    'model_artifact': bench_model_artifact,
+    'import': bench_import,
+    'columnar': bench_columnar,
+    'counts_cache': bench_counts_cache,
+    'compression': bench_compression,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,30 @@
+"""gunicorn settings for wsgi:app.
+
+Requests are a mix of short CPU work under the GIL (JSON rendering, count and
+forest lookups, the formula predictor) and I/O waits (Wikipedia lookups, each
+capped by the species lookup's latency budget). So there is one worker process
+per core for the CPU side, and a few threads per worker so a request blocked
+on a lookup doesn't idle its core. Both can be overridden from the environment.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:' + os.environ.get('PORT', '5001'))
+
+# Import wsgi.py (and run its warmup) in the master before forking
+preload_app = True
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Longer than the slowest request: a batch species lookup waits at most its budget
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so a slow leak can't grow unbounded
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
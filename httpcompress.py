@@ -0,0 +1,114 @@
+"""Response compression for the Flask app.
+
+init_compression(app) compresses text responses (JSON, HTML, CSV, NDJSON,
+JS, CSS) above a minimum size with the best encoding the client accepts:
+brotli and zstd when their optional packages are installed, gzip always.
+Responses that already carry a Content-Encoding (response cache hits, the
+pre-compressed static assets) are passed through untouched.
+"""
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MIN_SIZE = 1024  # bytes; below this the headers cost more than compression saves
+
+# Levels tuned for per-request work, not maximum ratio (see `python benchmarks.py compression`)
+LEVELS = {'br': 5, 'zstd': 3, 'gzip': 6}
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/geo+json', 'application/x-ndjson',
+    'application/javascript', 'text/javascript'
+}
+
+
+def available_encodings():
+    """Encodings this process can produce, in server preference order"""
+    encodings = []
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    encodings.append('gzip')
+    return encodings
+
+
+ENCODINGS = available_encodings()
+
+
+def compress(body, encoding, level=None):
+    level = LEVELS[encoding] if level is None else level
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, level, mtime=0)
+
+
+def negotiate(accept_encodings, encodings=None):
+    """The accepted encoding with the highest client quality, ties going to server preference"""
+    best, best_quality = None, 0
+    for encoding in encodings or ENCODINGS:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(response):
+    return response.mimetype.startswith('text/') or response.mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def _gzip_stream(chunks, level):
+    """Gzip a streamed body chunk by chunk, so memory stays bounded"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def init_compression(app, min_size=MIN_SIZE):
+    """Register the compression hook on app"""
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or response.direct_passthrough or not is_compressible(response)):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if response.is_streamed:
+            # Unknown length: gzip on the fly
+            if not request.accept_encodings['gzip']:
+                return response
+            response.response = _gzip_stream(response.response, LEVELS['gzip'])
+            response.headers.pop('Content-Length', None)
+            encoding = 'gzip'
+        else:
+            body = response.get_data()
+            encoding = negotiate(request.accept_encodings) if len(body) >= min_size else None
+            if encoding is None:
+                return response
+            response.set_data(compress(body, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names one representation; tag the encoded one apart
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+        return response
+
+    return compress_response
@@ -61,6 +61,7 @@ document.addEventListener('DOMContentLoaded', () => {
     activeFilters: 0,
     totalDiscoveries: 0,
     currentEra: null,
+    species: '',
     timelineActive: false
   };
 
@@ -121,13 +122,14 @@ document.addEventListener('DOMContentLoaded', () => {
     };
   }
 
-  // Enhanced feature interactions
+  // Enhanced feature interactions (counts are read at event time so the
+  // shared geometry layer can be recolored without being rebuilt)
   function onEachFeature(feature, layer) {
     const props = feature.properties;
-    const count = props.count || 0;
     
     layer.on({
       mouseover: e => {
+        const count = props.count || 0;
         e.target.setStyle({
           weight: 3,
           color: '#00ffff',
@@ -145,6 +147,7 @@ document.addEventListener('DOMContentLoaded', () => {
         layer.closeTooltip();
       },
       click: e => {
+        const count = props.count || 0;
         if (count > 0) {
           showCountryDetails(props);
           
@@ -164,22 +167,29 @@ document.addEventListener('DOMContentLoaded', () => {
         }
       }
     });
+  }
 
-    // Enhanced tooltip
-    if (count > 0) {
-      layer.bindTooltip(
-        `<div class="tooltip-content">
-          <strong>${props.ADMIN}</strong><br>
-          <span class="fossil-count">${count} discoveries</span><br>
-          <small>Click for details</small>
-        </div>`,
-        {
-          permanent: false,
-          sticky: true,
-          className: 'custom-tooltip',
-          direction: 'top'
-        }
-      );
+  // Enhanced tooltip, only shown for countries with discoveries
+  function updateTooltip(layer) {
+    const props = layer.feature.properties;
+    if ((props.count || 0) > 0) {
+      if (!layer.getTooltip()) {
+        layer.bindTooltip(
+          () => `<div class="tooltip-content">
+            <strong>${props.ADMIN}</strong><br>
+            <span class="fossil-count">${props.count} discoveries</span><br>
+            <small>Click for details</small>
+          </div>`,
+          {
+            permanent: false,
+            sticky: true,
+            className: 'custom-tooltip',
+            direction: 'top'
+          }
+        );
+      }
+    } else {
+      layer.unbindTooltip();
     }
   }
 
@@ -274,24 +284,53 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
+  // Fetch the world geometry once; filter changes only fetch counts
+  let geometryPromise = null;
+
+  function loadGeometry() {
+    if (!geometryPromise) {
+      // Content-hashed, pre-compressed build when available (see map.html)
+      geometryPromise = fetch(document.getElementById('map').dataset.geometryUrl || '/api/world-countries')
+        .then(response => {
+          if (!response.ok) {
+            throw new Error('Failed to load world geometry');
+          }
+          return response.json();
+        })
+        .then(geojson => {
+          geojson.features.forEach(feature => {
+            const props = feature.properties;
+            props.ADMIN = props.ADMIN || props.admin;
+            props.count = 0;
+          });
+          countriesLayer = L.geoJSON(geojson, {
+            style: style,
+            onEachFeature: onEachFeature
+          }).addTo(map);
+          return geojson;
+        })
+        .catch(error => {
+          geometryPromise = null;
+          throw error;
+        });
+    }
+    return geometryPromise;
+  }
+
   // Load and display country fossil data
   async function loadCountries() {
     showLoading(true);
-    
-    if (countriesLayer) {
-      countriesLayer.clearLayers();
-      map.removeLayer(countriesLayer);
-    }
 
     showFlashMessage('Excavating fossil database...', '⛏️', 0);
 
-    const params = new URLSearchParams();
+    const params = new URLSearchParams({ format: 'counts' });
     if (taxonSelect && taxonSelect.value) {
       params.set('group', taxonSelect.value.toLowerCase());
       state.activeFilters++;
     }
-    if (searchInput && searchInput.value.trim()) {
-      params.set('species', searchInput.value.trim().toLowerCase());
+    state.species = searchInput ? searchInput.value.trim().toLowerCase() : '';
+    if (state.species) {
+      params.set('species', state.species);
       state.activeFilters++;
     }
     if (eraFilter && eraFilter.value) {
@@ -302,28 +341,29 @@ document.addEventListener('DOMContentLoaded', () => {
     const url = `/maps/api/country-fossil-counts?${params.toString()}`;
     
     try {
-      const response = await fetch(url);
+      const [geojson, response] = await Promise.all([loadGeometry(), fetch(url)]);
       if (!response.ok) {
         throw new Error('Failed to load fossil data');
       }
 
-      const geojson = await response.json();
-
-      countriesLayer = L.geoJSON(geojson, {
-        style: style,
-        onEachFeature: onEachFeature
-      }).addTo(map);
+      const counts = await response.json();
 
-      // Calculate statistics
+      // Join the counts onto the shared geometry and recolor in place
       let totalFossilCount = 0;
       let countriesWithFossils = 0;
       
       geojson.features.forEach(feature => {
-        const count = feature.properties.count || 0;
+        const entry = counts[feature.properties.ADMIN];
+        const count = entry ? entry.count : 0;
+        feature.properties.count = count;
+        feature.properties.density = entry ? entry.density : 'none';
         totalFossilCount += count;
         if (count > 0) countriesWithFossils++;
       });
 
+      countriesLayer.setStyle(style);
+      countriesLayer.eachLayer(updateTooltip);
+
       state.totalDiscoveries = totalFossilCount;
       updateStats();
 
@@ -429,18 +469,46 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   }
 
+  // Species autocomplete: typing only fetches suggestions, the map reloads
+  // once a name is committed (picked from the list, Enter, or blur)
+  const speciesSuggestions = document.getElementById('species-suggestions');
+
+  async function loadSuggestions(query) {
+    if (!speciesSuggestions) return;
+    try {
+      const response = await fetch(`/maps/api/species-suggest?q=${encodeURIComponent(query)}&limit=8`);
+      if (!response.ok) return;
+      const data = await response.json();
+      if (searchInput.value.trim().toLowerCase() !== data.query) return; // stale response
+      speciesSuggestions.innerHTML = data.suggestions
+        .map(s => `<option value="${s.name}"></option>`)
+        .join('');
+    } catch (error) {
+      console.error('Error loading suggestions:', error);
+    }
+  }
+
+  function searchSpecies() {
+    if (searchInput.value.trim().toLowerCase() === state.species) return; // map already shows it
+    if (searchInput.value.trim()) {
+      showFlashMessage(`Searching for: ${searchInput.value.trim()}`, '🔎', 2000);
+    }
+    state.activeFilters = 0; // Reset counter
+    loadCountries();
+  }
+
   if (searchInput) {
     let searchTimeout;
     searchInput.addEventListener('input', () => {
       clearTimeout(searchTimeout);
-      searchTimeout = setTimeout(() => {
-        if (searchInput.value.trim()) {
-          showFlashMessage(`Searching for: ${searchInput.value.trim()}`, '🔎', 2000);
-        }
-        state.activeFilters = 0; // Reset counter
-        loadCountries();
-      }, 300);
+      const query = searchInput.value.trim();
+      if (!query) {
+        searchSpecies(); // cleared: back to the unfiltered map
+        return;
+      }
+      searchTimeout = setTimeout(() => loadSuggestions(query), 150);
     });
+    searchInput.addEventListener('change', searchSpecies);
   }
 
   if (eraFilter) {
@@ -507,6 +575,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const resetMapBtn = document.getElementById('reset-map');
   const randomFossilBtn = document.getElementById('random-fossil');
   const exportDataBtn = document.getElementById('export-data');
+  const exportFormat = document.getElementById('export-format');
 
   if (resetMapBtn) {
     resetMapBtn.addEventListener('click', () => {
@@ -531,11 +600,20 @@ document.addEventListener('DOMContentLoaded', () => {
 
   if (exportDataBtn) {
     exportDataBtn.addEventListener('click', () => {
-      showFlashMessage('Exporting fossil database...', '📊', 2000);
-      // Mock export functionality
-      setTimeout(() => {
-        showFlashMessage('Export complete! Check downloads.', '✅', 3000);
-      }, 2000);
+      // Same filters as the map; the server streams every matching record
+      const params = new URLSearchParams({ format: exportFormat ? exportFormat.value : 'csv' });
+      if (taxonSelect && taxonSelect.value) params.set('group', taxonSelect.value.toLowerCase());
+      if (searchInput && searchInput.value.trim()) params.set('species', searchInput.value.trim().toLowerCase());
+      if (eraFilter && eraFilter.value) params.set('era', eraFilter.value);
+
+      // A plain link download lets the browser write the stream straight to disk
+      const link = document.createElement('a');
+      link.href = `/maps/api/export-data?${params.toString()}`;
+      link.download = '';
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      showFlashMessage('Exporting fossil database... check downloads.', '📊', 3000);
     });
   }
 
@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import gzip
+import hashlib
+import logging
+import threading
+
+log = logging.getLogger("maps")
+
+ASSET_DIR = 'static/dist'
+MANIFEST_FILE = 'manifest.json'
+
+# Logical asset name -> source file, relative to the app root
+ASSET_SOURCES = {
+    'map.js': 'maplogic/map.js',
+    'map.css': 'maplogic/map.css',
+    'world_countries.geojson': 'static/world_countries.geojson'
+}
+ASSET_MIMETYPES = {
+    '.js': 'text/javascript',
+    '.css': 'text/css',
+    '.geojson': 'application/json'
+}
+
+# The map page only reads these country properties; the other ~160 (translated
+# names, codes, ranks) are most of the file's bulk
+GEOJSON_PROPERTIES = ['admin', 'name', 'iso_a3']
+GEOJSON_PRECISION = 3  # coordinate decimals, about 100 m; the source carries float noise to 15
+GEOJSON_TOLERANCE = 0.01  # degrees (about 1 km) a simplified border may move; invisible on a world map
+
+# <stem>.<12 hex content hash>.<ext>, as build_assets() names its output
+HASHED_NAME = re.compile(r'^[\w-]+\.[0-9a-f]{12}\.\w+$')
+
+# Content-Encoding -> file suffix, in server preference order
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _round_coordinates(coordinates):
+    if isinstance(coordinates, list):
+        return [_round_coordinates(item) for item in coordinates]
+    return round(coordinates, GEOJSON_PRECISION) if isinstance(coordinates, float) else coordinates
+
+
+def _simplify_ring(points, tolerance):
+    """Douglas-Peucker: drop points closer than tolerance to the line through the ones kept"""
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    limit = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[first][:2]
+        dx, dy = points[last][0] - x1, points[last][1] - y1
+        length = dx * dx + dy * dy
+        farthest, index = -1.0, None
+        for i in range(first + 1, last):
+            px, py = points[i][0] - x1, points[i][1] - y1
+            t = max(0.0, min(1.0, (px * dx + py * dy) / length)) if length else 0.0
+            distance = (px - t * dx) ** 2 + (py - t * dy) ** 2
+            if distance > farthest:
+                farthest, index = distance, i
+        if farthest > limit:
+            keep[index] = True
+            stack.extend([(first, index), (index, last)])
+    simplified = [point for point, kept in zip(points, keep) if kept]
+    # A closed ring needs four positions; tiny islands keep their full outline
+    return simplified if len(simplified) >= 4 else points
+
+
+def _simplify_coordinates(coordinates, tolerance=GEOJSON_TOLERANCE):
+    if not coordinates or not isinstance(coordinates[0], list):
+        return coordinates  # a single position
+    if not isinstance(coordinates[0][0], list):
+        return _simplify_ring(coordinates, tolerance)
+    return [_simplify_coordinates(item, tolerance) for item in coordinates]
+
+
+def slim_geojson(data):
+    """The world GeoJSON with only the properties the client uses and simplified, rounded coordinates"""
+    countries = json.loads(data)
+    for feature in countries['features']:
+        properties = feature.get('properties') or {}
+        feature['properties'] = {key: properties[key] for key in GEOJSON_PROPERTIES if key in properties}
+        if feature.get('geometry'):
+            coordinates = _simplify_coordinates(feature['geometry']['coordinates'])
+            feature['geometry']['coordinates'] = _round_coordinates(coordinates)
+    return json.dumps(countries, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def build_assets(root='.', out=ASSET_DIR):
+    """Write content-hashed copies of ASSET_SOURCES plus .gz/.br variants, returns the manifest.
+
+    Names carry a hash of the content, so they can be cached forever. Brotli
+    variants need the optional `brotli` package and are skipped without it.
+    Files from earlier builds are kept for pages that still reference them.
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        log.warning("brotli is not installed, building gzip variants only")
+
+    out = os.path.join(root, out)
+    os.makedirs(out, exist_ok=True)
+    manifest = {}
+    for name, source in ASSET_SOURCES.items():
+        with open(os.path.join(root, source), 'rb') as f:
+            data = f.read()
+        if name.endswith('.geojson'):
+            data = slim_geojson(data)
+
+        stem, ext = os.path.splitext(name)
+        filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        variants = {'identity': data, 'gzip': gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(data, quality=11)
+
+        for encoding, body in variants.items():
+            with open(os.path.join(out, filename + ENCODING_SUFFIXES.get(encoding, '')), 'wb') as f:
+                f.write(body)
+        manifest[name] = {'file': filename, 'sizes': {encoding: len(body) for encoding, body in variants.items()}}
+
+    manifest_path = os.path.join(out, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+class AssetManifest:
+    """The built assets: logical name -> hashed file, and hashed file -> available encodings"""
+
+    def __init__(self, path, mtime):
+        with open(path, encoding='utf-8') as f:
+            self.assets = json.load(f)
+        self.mtime = mtime
+        self.directory = os.path.dirname(path)
+        self.files = {asset['file']: asset for asset in self.assets.values()}
+
+    def has_file(self, filename):
+        """Whether a hashed file exists, from this build or an earlier one still on disk"""
+        if filename in self.files:
+            return True
+        return bool(HASHED_NAME.match(filename)) and os.path.isfile(os.path.join(self.directory, filename))
+
+    def filename(self, name):
+        asset = self.assets.get(name)
+        return asset['file'] if asset else None
+
+    def negotiate(self, filename, accept_encodings):
+        """(Content-Encoding or None, file suffix) of the best variant the client accepts"""
+        if filename in self.files:
+            available = self.files[filename]['sizes']
+        else:
+            # A file from an earlier build: its variants are whatever is still on disk
+            available = {encoding for encoding, suffix in ENCODING_SUFFIXES.items()
+                         if os.path.isfile(os.path.join(self.directory, filename + suffix))}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if encoding in available and accept_encodings[encoding]:
+                return encoding, suffix
+        return None, ''
+
+    @staticmethod
+    def mimetype(filename):
+        return ASSET_MIMETYPES.get(os.path.splitext(filename)[1], 'application/octet-stream')
+
+
+_lock = threading.Lock()
+_manifest = None
+
+
+def get_manifest(out=ASSET_DIR):
+    """The current build's manifest, None when `flask --app nuclear build-assets` has not run"""
+    global _manifest
+    path = os.path.join(out, MANIFEST_FILE)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    current = _manifest
+    if current is not None and current.mtime == mtime:
+        return current
+
+    with _lock:
+        if _manifest is None or _manifest.mtime != mtime:
+            _manifest = AssetManifest(path, mtime)
+        return _manifest
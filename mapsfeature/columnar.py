@@ -0,0 +1,176 @@
+import os
+import json
+import struct
+import logging
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger("maps")
+
+COLUMNAR_FORMAT = 1
+MANIFEST_FILE = 'manifest.json'
+DICTIONARIES_FILE = 'dictionaries.json'
+STREAM_MAGIC = b'DINOCOL1'
+
+
+def columnar_path(csv_path):
+    """Cache directory that sits next to the CSV: foo.csv -> foo.columns"""
+    return os.path.splitext(csv_path)[0] + '.columns'
+
+
+def _code_dtype(size):
+    """Smallest signed integer type holding codes 0..size-1 plus -1 for missing"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def build_columnar(csv_path, path=None):
+    """Convert the CSV into a few typed .npy blocks plus a JSON manifest, returns the manifest.
+
+    Numeric columns are stored as-is. Text columns are dictionary-encoded: small
+    int codes into the column's distinct values, kept in dictionaries.json.
+    Columns sharing a dtype share one 2-D `<dtype>.npy` block (one row per
+    column), so a load opens a handful of files however wide the CSV is. The
+    manifest records the CSV's size and mtime so editing the CSV invalidates the
+    cache, and it is written last so a half-built cache is never picked up.
+    """
+    path = path or columnar_path(csv_path)
+    stat = os.stat(csv_path)
+    df = pd.read_csv(csv_path)
+    os.makedirs(path, exist_ok=True)
+
+    blocks = {}
+    dictionaries = {}
+    columns = []
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values):
+            array = values.to_numpy()
+            encoding = 'plain'
+        else:
+            codes, categories = pd.factorize(values)
+            array = codes.astype(_code_dtype(len(categories)))
+            dictionaries[column] = [str(category) for category in categories]
+            encoding = 'dictionary'
+        block = blocks.setdefault(array.dtype.name, [])
+        columns.append({'name': column, 'encoding': encoding, 'dtype': str(values.dtype),
+                        'block': array.dtype.name, 'index': len(block)})
+        block.append(array)
+
+    for name, arrays in blocks.items():
+        np.save(os.path.join(path, name + '.npy'), np.stack(arrays), allow_pickle=False)
+    with open(os.path.join(path, DICTIONARIES_FILE), 'w', encoding='utf-8') as f:
+        json.dump(dictionaries, f, ensure_ascii=False)
+
+    manifest = {
+        'format': COLUMNAR_FORMAT,
+        'source': os.path.basename(csv_path),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'rows': len(df),
+        'blocks': sorted(blocks),
+        'columns': columns
+    }
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def load_columnar(csv_path, path=None):
+    """The CSV's DataFrame rebuilt from the columnar cache, or None if the cache is missing or stale.
+
+    Numeric columns are read-only views into memory-mapped blocks; text columns
+    are decoded from their dictionaries with one take per column. Dtypes match
+    pd.read_csv.
+    """
+    path = path or columnar_path(csv_path)
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    stat = os.stat(csv_path)
+    if (manifest.get('format') != COLUMNAR_FORMAT or manifest['source_size'] != stat.st_size
+            or manifest['source_mtime'] != stat.st_mtime):
+        log.info(f"Columnar cache {path} is stale, parsing {csv_path}")
+        return None
+
+    blocks = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r', allow_pickle=False)
+              for name in manifest['blocks']}
+    with open(os.path.join(path, DICTIONARIES_FILE), encoding='utf-8') as f:
+        dictionaries = json.load(f)
+
+    data = {}
+    for column in manifest['columns']:
+        name = column['name']
+        values = blocks[column['block']][column['index']]
+        if column['encoding'] == 'dictionary':
+            # Missing values have code -1, which picks the trailing NaN
+            values = np.array(dictionaries[name] + [np.nan], dtype=object)[values]
+        data[name] = values
+
+    df = pd.DataFrame(data, copy=False)
+    for column in manifest['columns']:
+        if str(df[column['name']].dtype) != column['dtype']:
+            df[column['name']] = df[column['name']].astype(column['dtype'])
+    return df
+
+
+def columnar_stream(chunks):
+    """Streamable columnar encoding of an iterable of DataFrame chunks, yielded frame by frame.
+
+    Layout: STREAM_MAGIC, then per chunk a little-endian uint32 header length,
+    a JSON header {"rows", "columns": [{"name", "dtype", "encoding", "buffer",
+    "nbytes", "dictionary"?}]} and the raw column buffers in header order. A
+    zero header length ends the stream. Text columns are dictionary-encoded per
+    chunk as int32 codes, -1 meaning missing. read_columnar_stream() decodes it.
+    """
+    yield STREAM_MAGIC
+    for chunk in chunks:
+        columns = []
+        buffers = []
+        for column in chunk.columns:
+            values = chunk[column]
+            spec = {'name': column, 'dtype': str(values.dtype)}
+            if pd.api.types.is_numeric_dtype(values):
+                array = np.ascontiguousarray(values.to_numpy())
+                spec['encoding'] = 'plain'
+            else:
+                codes, categories = pd.factorize(values)
+                array = codes.astype(np.int32)
+                spec['encoding'] = 'dictionary'
+                spec['dictionary'] = [str(category) for category in categories]
+            spec['buffer'] = array.dtype.str
+            spec['nbytes'] = array.nbytes
+            columns.append(spec)
+            buffers.append(array.tobytes())
+
+        header = json.dumps({'rows': len(chunk), 'columns': columns}, ensure_ascii=False).encode('utf-8')
+        yield struct.pack('<I', len(header)) + header + b''.join(buffers)
+    yield struct.pack('<I', 0)
+
+
+def read_columnar_stream(f):
+    """DataFrame from a binary file object holding columnar_stream() output"""
+    if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+        raise ValueError("Not a columnar export stream")
+
+    frames = []
+    while True:
+        (length,) = struct.unpack('<I', f.read(4))
+        if not length:
+            break
+        header = json.loads(f.read(length))
+        data = {}
+        for column in header['columns']:
+            values = np.frombuffer(f.read(column['nbytes']), dtype=column['buffer'])
+            if column['encoding'] == 'dictionary':
+                values = np.array(column['dictionary'] + [np.nan], dtype=object)[values]
+            data[column['name']] = pd.Series(values, dtype=column['dtype'])
+        frames.append(pd.DataFrame(data))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,106 @@
+import os
+import logging
+import itertools
+import threading
+from datetime import datetime
+from .search import NameIndex
+
+log = logging.getLogger("maps")
+
+CSV_PATH = 'dinosaur_ecosystem_impact_ml_ready.csv'
+
+# Columns the map filters on, copied into lowercase "<col>_lower" companions at load time
+NORMALIZED_COLUMNS = ['name', 'type', 'lived_in', 'geological_period']
+
+# Map era filter -> lowercased geological_period values it covers
+ERA_PERIODS = {
+    'triassic': ['late triassic', 'early triassic', 'middle triassic'],
+    'jurassic': ['late jurassic', 'early jurassic', 'mid jurassic', 'middle jurassic'],
+    'cretaceous': ['late cretaceous', 'early cretaceous']
+}
+PERIOD_ERAS = {period: era for era, periods in ERA_PERIODS.items() for period in periods}
+
+# Load counter: unlike the mtime-based version it only ever grows, even if the CSV is
+# swapped for an older file
+_generations = itertools.count(1)
+
+
+class FossilDataset:
+    """Read-only, pre-normalized snapshot of the fossil CSV"""
+
+    def __init__(self, df, mtime):
+        self.columns = list(df.columns)
+        for column in NORMALIZED_COLUMNS:
+            if column in df.columns:
+                df[column + '_lower'] = df[column].astype(str).str.strip().str.lower()
+        self.df = df
+        self.mtime = mtime
+        self.version = f"{int(mtime * 1000):x}-{len(df)}"
+        self.generation = next(_generations)
+        # Responses stamp this instead of the wall clock, so identical requests get identical bytes
+        self.updated_at = datetime.fromtimestamp(mtime).isoformat()
+        self.count_cube = self._build_count_cube()
+        self.name_index = NameIndex(df['name_lower']) if self.has('name') else None
+
+    def has(self, column):
+        return column in self.columns
+
+    def _build_count_cube(self):
+        """Fossil counts per location for every (type, era) pair, '' meaning "any".
+
+        The map only filters on a handful of types and eras, so every dropdown
+        combination is answered by one dict lookup instead of a DataFrame scan.
+        """
+        if not all(self.has(column) for column in ('type', 'geological_period', 'lived_in')):
+            return None
+
+        df = self.df
+        eras = df['geological_period_lower'].map(PERIOD_ERAS).fillna('')
+        grouped = df.groupby([df['type_lower'], eras, df['lived_in_lower']]).size()
+
+        cube = {}
+        for (dino_type, era, location), count in grouped.items():
+            for key in {(dino_type, era), (dino_type, ''), ('', era), ('', '')}:
+                locations = cube.setdefault(key, {})
+                locations[location] = locations.get(location, 0) + int(count)
+        return cube
+
+    def location_counts(self, group='', era=''):
+        """Fossil counts per lowercased lived_in for a type/era filter ('' matches any)"""
+        if era not in ERA_PERIODS:
+            era = ''
+        return self.count_cube.get((group, era), {})
+
+    def records(self, df=None):
+        """Original CSV columns only, without the normalized companions"""
+        df = self.df if df is None else df
+        return df[self.columns]
+
+
+def read_fossils(path=CSV_PATH):
+    """The CSV as a DataFrame, from its columnar cache (`flask --app nuclear build-fossil-cache`) when current"""
+    # Deferred: most requests never touch the CSV
+    import pandas as pd
+    from .columnar import load_columnar
+
+    df = load_columnar(path)
+    return df if df is not None else pd.read_csv(path)
+
+
+_lock = threading.Lock()
+_dataset = None
+
+
+def get_dataset(path=CSV_PATH):
+    """Return the shared dataset, re-reading the CSV only when its mtime changes"""
+    global _dataset
+    mtime = os.stat(path).st_mtime
+    current = _dataset
+    if current is not None and current.mtime == mtime:
+        return current
+
+    with _lock:
+        if _dataset is None or _dataset.mtime != mtime:
+            _dataset = FossilDataset(read_fossils(path), mtime)
+            log.info(f"Loaded {len(_dataset.df)} fossil records (version {_dataset.version})")
+        return _dataset
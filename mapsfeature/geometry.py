@@ -0,0 +1,103 @@
+import json
+import logging
+import threading
+
+log = logging.getLogger("maps")
+
+GEOJSON_FILE = 'world_countries.geojson'
+
+# lived_in spellings that differ from the GeoJSON ADMIN names, and regions that
+# span several countries (a fossil from a region is counted in each of them)
+LOCATION_ALIASES = {
+    'usa': ['United States of America'],
+    'us': ['United States of America'],
+    'united states': ['United States of America'],
+    'uk': ['United Kingdom'],
+    'england': ['United Kingdom'],
+    'scotland': ['United Kingdom'],
+    'wales': ['United Kingdom'],
+    'tanzania': ['United Republic of Tanzania'],
+    'serbia': ['Republic of Serbia'],
+    'czech republic': ['Czechia'],
+    'macedonia': ['North Macedonia'],
+    'swaziland': ['eSwatini'],
+    'bahamas': ['The Bahamas'],
+    "cote d'ivoire": ['Ivory Coast'],
+    'north africa': ['Morocco', 'Algeria', 'Tunisia', 'Libya', 'Egypt'],
+}
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class WorldGeometry:
+    """World countries GeoJSON parsed once, with each feature pre-serialized.
+
+    Geometry never changes between requests, so every feature is kept as a
+    ready-made JSON fragment with its properties object left open. A response
+    only appends the per-request properties and joins the fragments, which
+    avoids re-parsing, deep-copying or re-encoding the polygons.
+    """
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            countries = json.load(f)
+
+        self.properties = []
+        self.names = []
+        self._heads = []
+        self._tails = []
+        for feature in countries['features']:
+            properties = feature.get('properties') or {}
+            self.properties.append(properties)
+            self.names.append(properties.get('ADMIN') or properties.get('admin') or '')
+            self._heads.append(b'{"type":"Feature","properties":' + _dumps(properties)[:-1])
+            self._tails.append(b'},"geometry":' + _dumps(feature.get('geometry')) + b'}')
+        # Lowercased lived_in value -> indices of the features it belongs to
+        self.locations = {}
+        for i, name in enumerate(self.names):
+            key = name.strip().lower()
+            self.locations[key] = self.locations.get(key, ()) + (i,)
+        for alias, targets in LOCATION_ALIASES.items():
+            self.locations[alias] = tuple(
+                i for target in targets for i in self.locations.get(target.lower(), ())
+            )
+        log.info(f"Parsed {len(self.properties)} country geometries from {path}")
+
+    def __len__(self):
+        return len(self.properties)
+
+    def resolve(self, location):
+        """Feature indices for a lowercased lived_in value, empty if it matches no country"""
+        return self.locations.get(location, ())
+
+    def render(self, overlays, metadata):
+        """UTF-8 FeatureCollection with overlays[i] merged into feature i's properties"""
+        parts = [b'{"type":"FeatureCollection","features":[']
+        for i, (properties, overlay) in enumerate(zip(self.properties, overlays)):
+            extra = _dumps(overlay)[1:-1]
+            if i:
+                parts.append(b',')
+            parts.append(self._heads[i])
+            if properties and extra:
+                parts.append(b',')
+            parts.append(extra)
+            parts.append(self._tails[i])
+        parts.append(b'],"metadata":' + _dumps(metadata) + b'}')
+        return b''.join(parts)
+
+
+_lock = threading.Lock()
+_geometry = {}
+
+
+def get_geometry(path):
+    """Return the parsed geometry for path, loading it on first use"""
+    geometry = _geometry.get(path)
+    if geometry is None:
+        with _lock:
+            geometry = _geometry.get(path)
+            if geometry is None:
+                geometry = _geometry[path] = WorldGeometry(path)
+    return geometry
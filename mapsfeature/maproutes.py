@@ -1,102 +1,149 @@
-import json
-import pandas as pd
+import os
 import logging
 import random
-from flask import Blueprint, render_template, jsonify, request, current_app
-from datetime import datetime
+import time
+import hashlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, render_template, jsonify, request, current_app, make_response, send_file, url_for
+from .datastore import ERA_PERIODS, get_dataset
+from .geometry import GEOJSON_FILE, get_geometry
+from .responsecache import ResponseCache
+from .assets import get_manifest
+from httpcompress import ENCODINGS, negotiate
 
 map_routes = Blueprint('maps', __name__, template_folder='../template', static_folder='../maplogic')
 
 log = logging.getLogger("maps")
 logging.basicConfig(level=logging.INFO)
 
+# Bump when the body of an API response changes for the same dataset and query,
+# so clients holding old ETags refetch after a deploy
+API_REVISION = 1
+API_MAX_AGE = 60  # seconds a client may reuse a response before revalidating
+
+def request_etag(version):
+    """Strong ETag for the current URL's response under a dataset version"""
+    query = sorted(request.args.items(multi=True))
+    digest = hashlib.sha1(repr((API_REVISION, request.path, query)).encode('utf-8')).hexdigest()[:16]
+    return f"{version}-{digest}"
+
+def versioned(view):
+    """HTTP caching for read endpoints whose output depends only on the dataset and the URL.
+    
+    Sets a strong ETag (with an -<encoding> variant for compressed bodies) and
+    Cache-Control, and answers If-None-Match (weak or strong) with 304 without running the view.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            etag = request_etag(get_dataset().version)
+        except FileNotFoundError:
+            return view(*args, **kwargs)  # the view reports the missing CSV
+            
+        # If-None-Match uses weak comparison (RFC 7232 3.2): proxies that compress
+        # on the fly send our tags back as W/"..."
+        variants = [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]
+        matched = next((tag for tag in variants if request.if_none_match.contains_weak(tag)), None)
+        if matched is not None:
+            response = Response(status=304)
+            response.set_etag(matched)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.set_etag(f"{etag}-{response.content_encoding}" if response.content_encoding else etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = API_MAX_AGE
+        response.vary.add('Accept-Encoding')
+        return response
+    return wrapper
+
+def no_store(view):
+    """Mark a read endpoint's responses as uncacheable (random or live output)"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        response.cache_control.no_store = True
+        return response
+    return wrapper
+
 @map_routes.route('/')
 def map_page():
     return render_template('map.html')
 
+# Where the page loads each asset from when `flask --app nuclear build-assets` hasn't run
+ASSET_FALLBACK_URLS = {'world_countries.geojson': '/api/world-countries'}
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+@map_routes.context_processor
+def asset_helpers():
+    def asset_url(name):
+        """Content-hashed URL of a built asset, or its unhashed URL when assets aren't built"""
+        manifest = get_manifest()
+        filename = manifest.filename(name) if manifest is not None else None
+        if filename is not None:
+            return url_for('maps.built_asset', filename=filename)
+        return ASSET_FALLBACK_URLS.get(name) or url_for('maps.static', filename=name)
+    return {'asset_url': asset_url}
+
+@map_routes.route('/assets/<filename>')
+def built_asset(filename):
+    """A content-hashed asset in the best encoding the client accepts, cacheable forever.
+    Files from earlier builds are still served, for pages cached before a rebuild."""
+    manifest = get_manifest()
+    if manifest is None or not manifest.has_file(filename):
+        return jsonify({"error": "Unknown asset"}), 404
+    response = send_asset(manifest, filename, max_age=ASSET_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+def send_asset(manifest, filename, max_age=None):
+    """Send the pre-compressed variant of a built file negotiated from Accept-Encoding
+    (revalidated on every use unless max_age is given)"""
+    encoding, suffix = manifest.negotiate(filename, request.accept_encodings)
+    response = send_file(os.path.abspath(os.path.join(manifest.directory, filename + suffix)),
+                         mimetype=manifest.mimetype(filename), conditional=True, max_age=max_age)
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Serialized country-count responses per (species, group, era, format), for the current dataset version
+counts_cache = ResponseCache()
+
 @map_routes.route('/api/country-fossil-counts')
+@versioned
 def country_fossil_counts():
-    """Enhanced fossil data endpoint with geological era filtering"""
+    """Enhanced fossil data endpoint with geological era filtering.
+    
+    ?format=counts returns only {ADMIN: {count, density}} for countries with fossils.
+    Responses are served from counts_cache until the dataset reloads.
+    """
     try:
-        df = pd.read_csv('dinosaur_ecosystem_impact_ml_ready.csv')
+        dataset = get_dataset()
         
         # Get filter parameters
         species_filter = request.args.get('species', '').strip().lower()
         group_filter = request.args.get('group', '').strip().lower()  
         era_filter = request.args.get('era', '').strip().lower()
+        response_format = 'counts' if request.args.get('format', '').strip().lower() == 'counts' else 'geojson'
         
         log.info(f"Filtering - Species: {species_filter}, Group: {group_filter}, Era: {era_filter}")
         
-        # Apply species filter
-        if species_filter and 'name' in df.columns:
-            df = df[df['name'].astype(str).str.lower().str.contains(species_filter, na=False)]
-            
-        # Apply group/type filter
-        if group_filter and 'type' in df.columns:
-            df = df[df['type'].astype(str).str.lower() == group_filter]
-            
-        # Apply geological era filter
-        if era_filter and 'geological_period' in df.columns:
-            era_mapping = {
-                'triassic': ['late triassic', 'early triassic', 'middle triassic'],
-                'jurassic': ['late jurassic', 'early jurassic', 'mid jurassic', 'middle jurassic'], 
-                'cretaceous': ['late cretaceous', 'early cretaceous']
-            }
-            
-            if era_filter in era_mapping:
-                periods = era_mapping[era_filter]
-                df = df[df['geological_period'].astype(str).str.lower().isin(periods)]
-        
         # Check for required column
-        if 'lived_in' not in df.columns:
+        if not dataset.has('lived_in'):
             return jsonify({"error": "Missing 'lived_in' column in CSV"}), 400
             
-        # Count fossils by location
-        location_counts = df['lived_in'].astype(str).str.strip().str.lower().value_counts().to_dict()
+        # A reloaded CSV drops the cache; rebuild the dropdown views off the request path
+        refresh_precomputed_views(current_app._get_current_object(), dataset)
         
-        # Load world countries GeoJSON
-        geojson_path = current_app.static_folder + '/world_countries.geojson'
-        with open(geojson_path, encoding='utf-8') as f:
-            countries = json.load(f)
-            
-        # Enhanced country matching with better normalization
-        total_fossils = 0
-        countries_with_data = 0
-        
-        for feature in countries['features']:
-            country_name = feature['properties'].get('ADMIN', '').strip().lower()
-            
-            # Try exact match first
-            count = location_counts.get(country_name, 0)
-            
-            # If no exact match, try partial matching for common variations
-            if count == 0:
-                for location, location_count in location_counts.items():
-                    if country_name in location or location in country_name:
-                        count += location_count
-                        
-            feature['properties']['count'] = count
-            feature['properties']['density'] = get_density_category(count)
-            feature['properties']['last_updated'] = datetime.now().isoformat()
-            
-            if count > 0:
-                total_fossils += count
-                countries_with_data += 1
-                
-        # Add metadata to response
-        countries['metadata'] = {
-            'total_fossils': total_fossils,
-            'countries_with_data': countries_with_data,
-            'filters_applied': {
-                'species': species_filter,
-                'group': group_filter, 
-                'era': era_filter
-            },
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        log.info(f"Processed {total_fossils} fossils across {countries_with_data} countries")
-        return jsonify(countries)
+        key = (species_filter, group_filter, era_filter, response_format)
+        entry = counts_cache.get(dataset.generation, key)
+        if entry is None:
+            entry = counts_cache.put(dataset.generation, key, render_country_counts(dataset, *key), 'application/json')
+        return cached_response(entry)
         
     except FileNotFoundError:
         log.error("CSV file not found")
@@ -105,6 +152,165 @@ def country_fossil_counts():
         log.error(f"Error processing fossil data: {str(e)}")
         return jsonify({"error": "Failed to process fossil data"}), 500
 
+def render_country_counts(dataset, species_filter, group_filter, era_filter, response_format):
+    """Serialized country-fossil-counts body for one set of (lowercased) filters"""
+    # Count fossils by location: dropdown-only filters come straight from the
+    # precomputed cube, species searches filter the rows themselves
+    if species_filter or dataset.count_cube is None:
+        df = filter_fossils(dataset, species_filter, group_filter, era_filter)
+        location_counts = df['lived_in_lower'].value_counts().to_dict()
+    else:
+        location_counts = dataset.location_counts(group_filter, era_filter)
+    
+    # Shared, pre-parsed world countries geometry
+    geometry = get_geometry(os.path.join(current_app.static_folder, GEOJSON_FILE))
+        
+    # Resolve each distinct location to its countries with one table lookup
+    total_fossils = 0
+    counts = [0] * len(geometry)
+    
+    for location, location_count in location_counts.items():
+        indices = geometry.resolve(location)
+        if not indices:
+            log.debug(f"No country matches location '{location}'")
+            continue
+        total_fossils += location_count
+        for i in indices:
+            counts[i] += location_count
+            
+    countries_with_data = sum(1 for count in counts if count > 0)
+            
+    log.info(f"Processed {total_fossils} fossils across {countries_with_data} countries")
+    
+    # Counts-only mode: the client already holds the geometry from /api/world-countries
+    if response_format == 'counts':
+        return jsonify({
+            name: {'count': count, 'density': get_density_category(count)}
+            for name, count in zip(geometry.names, counts)
+            if count > 0
+        }).get_data()
+    
+    last_updated = dataset.updated_at
+    overlays = [
+        {'count': count, 'density': get_density_category(count), 'last_updated': last_updated}
+        for count in counts
+    ]
+            
+    # Add metadata to response
+    metadata = {
+        'total_fossils': total_fossils,
+        'countries_with_data': countries_with_data,
+        'filters_applied': {
+            'species': species_filter,
+            'group': group_filter, 
+            'era': era_filter
+        },
+        'generated_at': dataset.updated_at
+    }
+    
+    return geometry.render(overlays, metadata)
+
+def cached_response(entry):
+    """Response for a counts_cache entry, in the best encoding the client accepts (compressed once, on first use)"""
+    encoding = negotiate(request.accept_encodings) if entry.compressible else None
+    if encoding is not None:
+        response = Response(counts_cache.encoded(entry, encoding), mimetype=entry.mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = Response(entry.body, mimetype=entry.mimetype)
+    response.vary.add('Accept-Encoding')
+    return response
+
+def precompute_country_counts(app, workers=4):
+    """Render, serialize and compress every type x era view the map can ask for without a species.
+
+    Runs at startup, and again in the background whenever the dataset reloads,
+    so dropdown changes are always cache hits. The page's group dropdown sends
+    the CSV's `type` values. Returns a report with the number of views, the
+    time taken and the bytes they occupy.
+    """
+    global _precomputed_version
+    start = time.perf_counter()
+    with app.app_context():
+        dataset = get_dataset()
+        get_geometry(os.path.join(app.static_folder, GEOJSON_FILE))
+    _precomputed_version = dataset.generation
+    counts_cache.use_version(dataset.generation)
+    
+    if dataset.count_cube is not None:
+        types = {group for group, _ in dataset.count_cube if group}
+    else:
+        types = set(dataset.df['type_lower']) if dataset.has('type') else set()
+    groups = [''] + sorted(types)
+    keys = [('', group, era, 'counts') for group in groups for era in [''] + list(ERA_PERIODS)]
+    
+    def render(key):
+        with app.app_context():
+            entry = counts_cache.put(dataset.generation, key, render_country_counts(dataset, *key), 'application/json')
+            if entry.compressible:
+                for encoding in ENCODINGS:
+                    counts_cache.encoded(entry, encoding)
+            return entry
+            
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='precompute') as pool:
+        entries = list(pool.map(render, keys))
+        
+    report = {
+        'views': len(entries),
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        'body_bytes': sum(len(entry.body) for entry in entries),
+        'gzipped_bytes': sum(len(entry.encodings.get('gzip', b'')) for entry in entries)
+    }
+    log.info(f"Precomputed country counts: {report}")
+    return report
+
+# Dataset generation the views were last precomputed for
+_precomputed_version = None
+_precompute_lock = threading.Lock()
+
+def refresh_precomputed_views(app, dataset):
+    """Re-run precompute_country_counts in the background the first time a new dataset version is seen"""
+    global _precomputed_version
+    if dataset.generation == _precomputed_version:
+        return
+    with _precompute_lock:
+        if dataset.generation == _precomputed_version:
+            return
+        _precomputed_version = dataset.generation
+    threading.Thread(target=precompute_country_counts, args=(app,), name='precompute', daemon=True).start()
+
+@map_routes.route('/api/cache-stats')
+@no_store
+def cache_stats():
+    """Hit/miss counters of the country-counts response cache"""
+    return jsonify({'country_counts': counts_cache.snapshot()})
+
+def matching_rows(dataset, species_filter='', group_filter='', era_filter=''):
+    """Positional ids of the rows matching the map filters (all arguments already lowercased)"""
+    import numpy as np  # loaded with the dataset anyway, kept off the import path
+    df = dataset.df
+    mask = np.ones(len(df), dtype=bool)
+    
+    # Apply species filter through the name index (row ids into the full frame)
+    if species_filter and dataset.name_index is not None:
+        species = np.zeros(len(df), dtype=bool)
+        species[dataset.name_index.substring(species_filter)] = True
+        mask &= species
+        
+    # Apply group/type filter
+    if group_filter and dataset.has('type'):
+        mask &= (df['type_lower'] == group_filter).to_numpy()
+        
+    # Apply geological era filter
+    if era_filter in ERA_PERIODS and dataset.has('geological_period'):
+        mask &= df['geological_period_lower'].isin(ERA_PERIODS[era_filter]).to_numpy()
+        
+    return np.flatnonzero(mask)
+
+def filter_fossils(dataset, species_filter='', group_filter='', era_filter=''):
+    """Rows matching the map filters (all arguments already lowercased)"""
+    return dataset.df.iloc[matching_rows(dataset, species_filter, group_filter, era_filter)]
+
 def get_density_category(count):
     """Categorize fossil density for enhanced visualization"""
     if count > 100:
@@ -120,14 +326,33 @@ def get_density_category(count):
     else:
         return "none"
 
+@map_routes.route('/api/species-suggest')
+@versioned
+def species_suggest():
+    """Autocomplete species names by prefix, substring and typo-tolerant match"""
+    try:
+        dataset = get_dataset()
+        query = request.args.get('q', '').strip().lower()
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        
+        if not query or dataset.name_index is None:
+            return jsonify({'query': query, 'suggestions': []})
+            
+        return jsonify({'query': query, 'suggestions': dataset.name_index.suggest(query, limit)})
+        
+    except Exception as e:
+        log.error(f"Error suggesting species: {str(e)}")
+        return jsonify({"error": "Failed to suggest species"}), 500
+
 @map_routes.route('/api/fossil-details/<country>')
+@versioned
 def fossil_details(country):
     """Get detailed fossil information for a specific country"""
     try:
-        df = pd.read_csv('dinosaur_ecosystem_impact_ml_ready.csv')
+        df = get_dataset().df
         
         # Filter data for the specific country
-        country_data = df[df['lived_in'].astype(str).str.lower().str.contains(country.lower(), na=False)]
+        country_data = df[df['lived_in_lower'].str.contains(country.lower(), regex=False)]
         
         if country_data.empty:
             return jsonify({"error": f"No fossil data found for {country}"}), 404
@@ -155,10 +380,11 @@ def fossil_details(country):
         return jsonify({"error": "Failed to get fossil details"}), 500
 
 @map_routes.route('/api/fossil-timeline')
+@versioned
 def fossil_timeline():
     """Get fossil discovery timeline data"""
     try:
-        df = pd.read_csv('dinosaur_ecosystem_impact_ml_ready.csv')
+        df = get_dataset().df
         
         # Create mock timeline data based on geological periods
         timeline_data = []
@@ -199,10 +425,11 @@ def get_period_description(period):
     return descriptions.get(period, 'Ancient period of prehistoric life')
 
 @map_routes.route('/api/random-discovery')
+@no_store
 def random_discovery():
     """Generate a random fossil discovery for exploration"""
     try:
-        df = pd.read_csv('dinosaur_ecosystem_impact_ml_ready.csv')
+        df = get_dataset().df
         
         if not df.empty:
             # Select random fossil
@@ -241,21 +468,43 @@ def generate_significance_text():
     ]
     return random.choice(significance_options)
 
+# Streamed export formats: (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'columnar': ('application/octet-stream', 'dinocol')
+}
+EXPORT_CHUNK_ROWS = 5000
+
 @map_routes.route('/api/export-data')
+@versioned
 def export_data():
-    """Export filtered fossil data"""
+    """Export filtered fossil data.
+    
+    Without ?format= this returns a JSON summary with the first 100 records. With
+    ?format=csv|ndjson|columnar every matching record is streamed in chunks.
+    """
     try:
-        df = pd.read_csv('dinosaur_ecosystem_impact_ml_ready.csv')
+        dataset = get_dataset()
         
         # Apply any filters from query parameters
         species_filter = request.args.get('species', '').strip().lower()
         group_filter = request.args.get('group', '').strip().lower()
+        era_filter = request.args.get('era', '').strip().lower()
+        export_format = request.args.get('format', '').strip().lower()
         
-        if species_filter and 'name' in df.columns:
-            df = df[df['name'].astype(str).str.lower().str.contains(species_filter, na=False)]
-            
-        if group_filter and 'type' in df.columns:
-            df = df[df['type'].astype(str).str.lower() == group_filter]
+        if export_format:
+            if export_format not in EXPORT_FORMATS:
+                return jsonify({"error": f"Unknown format '{export_format}', expected one of: {', '.join(EXPORT_FORMATS)}"}), 400
+            rows = matching_rows(dataset, species_filter, group_filter, era_filter)
+            mimetype, extension = EXPORT_FORMATS[export_format]
+            return Response(
+                stream_export(dataset, rows, export_format),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename="fossil_export.{extension}"'}
+            )
+        
+        df = dataset.records(filter_fossils(dataset, species_filter, group_filter, era_filter))
             
         # Generate summary statistics
         export_data = {
@@ -266,7 +515,7 @@ def export_data():
                 'time_periods': df['geological_period'].nunique() if 'geological_period' in df.columns else 0
             },
             'data': df.head(100).to_dict('records') if not df.empty else [],
-            'export_timestamp': datetime.now().isoformat()
+            'export_timestamp': dataset.updated_at
         }
         
         return jsonify(export_data)
@@ -274,3 +523,20 @@ def export_data():
     except Exception as e:
         log.error(f"Error exporting data: {str(e)}")
         return jsonify({"error": "Failed to export data"}), 500
+
+def stream_export(dataset, rows, export_format):
+    """Encoded chunks of the given rows; only one chunk is materialized at a time"""
+    # Bound to the snapshot taken when the request started, so a reload mid-stream can't mix versions
+    chunks = (dataset.records(dataset.df.iloc[rows[start:start + EXPORT_CHUNK_ROWS]])
+              for start in range(0, max(len(rows), 1), EXPORT_CHUNK_ROWS))
+    
+    if export_format == 'columnar':
+        from .columnar import columnar_stream
+        yield from columnar_stream(chunks)
+        return
+        
+    for i, chunk in enumerate(chunks):
+        if export_format == 'csv':
+            yield chunk.to_csv(index=False, header=i == 0)
+        elif len(chunk):
+            yield chunk.to_json(orient='records', lines=True, force_ascii=False)
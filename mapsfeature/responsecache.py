@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from httpcompress import compress
+
+
+class CachedResponse:
+    """A fully serialized response body plus the compressed encodings made of it so far"""
+
+    def __init__(self, key, body, mimetype, compressible=True):
+        self.key = key
+        self.body = body
+        self.mimetype = mimetype
+        self.compressible = compressible
+        self.encodings = {}
+
+    def __len__(self):
+        return len(self.body) + sum(len(data) for data in self.encodings.values())
+
+
+class ResponseCache:
+    """LRU of serialized responses for one dataset version, bounded by count and bytes.
+
+    Keys are the normalized request parameters. Versions must grow with each
+    reload (FossilDataset.generation). Every entry was rendered from the same
+    dataset snapshot; the first lookup against a newer version drops them all,
+    so a reloaded CSV is never answered from stale bytes. The cache only moves
+    forward: a lookup from an older snapshot (a request that started before the
+    reload) misses without touching the entries, and a put() rendered from any
+    other snapshot is returned to its caller but not stored.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024, compress_min_size=1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_min_size = compress_min_size
+        self.version = None
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def use_version(self, version):
+        """Start caching for a dataset version (dropping older entries), as a lookup would"""
+        with self._lock:
+            self._check_version(version)
+
+    def _check_version(self, version):
+        """Move to version if it is newer; False when it is older than the cached one"""
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            if self._entries:
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.version = version
+        return True
+
+    def get(self, version, key):
+        """The cached response for key, or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(key) if self._check_version(version) else None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, version, key, body, mimetype):
+        """Store a rendered body and return the entry; encodings are made on first use by encoded()"""
+        entry = CachedResponse(key, body, mimetype, compressible=len(body) >= self.compress_min_size)
+        with self._lock:
+            if version != self.version:
+                return entry
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = entry
+            self._bytes += len(entry)
+            self._evict()
+        return entry
+
+    def encoded(self, entry, encoding):
+        """entry's body in a Content-Encoding, compressed (outside the lock) the first time it is asked for"""
+        data = entry.encodings.get(encoding)
+        if data is not None:
+            return data
+        data = compress(entry.body, encoding)
+        with self._lock:
+            if encoding in entry.encodings:
+                return entry.encodings[encoding]
+            entry.encodings[encoding] = data
+            # Only count it if the entry is still stored (not evicted or invalidated meanwhile)
+            if self._entries.get(entry.key) is entry:
+                self._bytes += len(data)
+                self._evict()
+        return data
+
+    def _evict(self):
+        # Oldest first, but never the newest entry
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.stats['evictions'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'version': self.version
+            }
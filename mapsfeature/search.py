@@ -0,0 +1,97 @@
+import bisect
+
+
+def trigrams(text):
+    """Padded character trigrams, so short names and word edges still produce grams"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Species name lookups by prefix, substring or trigram similarity.
+
+    Built once per dataset from the lowercased `name` column. Lookups return
+    positional row ids into that column, so callers can `df.iloc[ids]`.
+    """
+
+    def __init__(self, names):
+        self._rows = {}
+        for row, name in enumerate(names):
+            self._rows.setdefault(name, []).append(row)
+
+        # Distinct names, sorted for prefix bisection
+        self.names = sorted(self._rows)
+
+        # Trigram -> ids of the distinct names containing it
+        self._grams = {}
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self._grams.setdefault(gram, set()).add(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def rows(self, names):
+        """Sorted row ids of every record with one of the given names"""
+        return sorted(row for name in names for row in self._rows[name])
+
+    def prefix_names(self, query):
+        start = bisect.bisect_left(self.names, query)
+        end = bisect.bisect_left(self.names, query + '\uffff')
+        return self.names[start:end]
+
+    def substring_names(self, query):
+        if len(query) < 3:
+            return [name for name in self.names if query in name]
+
+        # Every trigram of the query must occur in a match; verify the survivors
+        candidates = None
+        for i in range(len(query) - 2):
+            ids = self._grams.get(query[i:i + 3])
+            if not ids:
+                return []
+            candidates = ids if candidates is None else candidates & ids
+        return [self.names[i] for i in sorted(candidates) if query in self.names[i]]
+
+    def fuzzy_names(self, query, limit=10, threshold=0.3):
+        """Names ranked by trigram Jaccard similarity, tolerant of typos"""
+        grams = trigrams(query)
+        shared = {}
+        for gram in grams:
+            for i in self._grams.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        scored = []
+        for i, hits in shared.items():
+            name = self.names[i]
+            score = hits / (len(grams) + len(trigrams(name)) - hits)
+            if score >= threshold:
+                scored.append((score, name))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [name for _, name in scored[:limit]]
+
+    def prefix(self, query):
+        return self.rows(self.prefix_names(query))
+
+    def substring(self, query):
+        return self.rows(self.substring_names(query))
+
+    def fuzzy(self, query, limit=10, threshold=0.3):
+        return self.rows(self.fuzzy_names(query, limit, threshold))
+
+    def suggest(self, query, limit=10):
+        """Autocomplete candidates: prefix matches first, then substring, then fuzzy"""
+        suggestions = []
+        seen = set()
+        for match, lookup in (
+            ('prefix', self.prefix_names),
+            ('substring', self.substring_names),
+            ('fuzzy', self.fuzzy_names),
+        ):
+            if len(suggestions) >= limit:
+                break
+            for name in lookup(query):
+                if name not in seen and len(suggestions) < limit:
+                    seen.add(name)
+                    suggestions.append({'name': name, 'match': match})
+        return suggestions
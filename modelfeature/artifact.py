@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import numpy as np
+from .forest import CompiledForest, ImpactModel
+
+MODEL_PICKLE = 'dinosaur_impact_predictor.pkl'
+MODEL_ARTIFACT = 'dinosaur_impact_predictor.model'
+ARTIFACT_FORMAT = 1
+MANIFEST_FILE = 'manifest.json'
+# Size and mtime of the source last seen to match source_sha256 on this machine. Not
+# committed: checkouts don't keep mtimes, so it is written by the first load that hashes
+VERIFIED_FILE = 'verified.json'
+
+# CompiledForest node arrays, each stored as <name>.npy next to the manifest
+FOREST_ARRAYS = ['left', 'right', 'feature', 'threshold', 'value', 'roots']
+
+
+class StaleArtifactError(Exception):
+    """The artifact is from another format version or another pickle"""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(source):
+    stat = os.stat(source)
+    return {'source_size': stat.st_size, 'source_mtime': stat.st_mtime}
+
+
+def _write_json(path, data, **kwargs):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(path + '.tmp', path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _check_source(path, manifest, source):
+    """Raise StaleArtifactError unless source is the pickle the artifact was exported from.
+
+    Normally a stat: the sha256 is only computed when the source's size and
+    mtime differ from the last verified ones, e.g. on a fresh checkout.
+    """
+    stat = _source_stat(source)
+    if stat['source_size'] != manifest.get('source_size'):
+        raise StaleArtifactError(f"{path} was exported from a different {source}")
+    if _read_json(os.path.join(path, VERIFIED_FILE)) == stat:
+        return
+    if file_sha256(source) != manifest['source_sha256']:
+        raise StaleArtifactError(f"{path} was exported from a different {source}")
+    try:
+        _write_json(os.path.join(path, VERIFIED_FILE), stat)
+    except OSError:
+        pass  # read-only deploy: hash again next start
+
+
+def export_artifact(model_data, path=MODEL_ARTIFACT, source=MODEL_PICKLE):
+    """Write the pickled model as raw .npy arrays plus a JSON manifest, returns the manifest.
+
+    Arrays are written first and the manifest last, so a half-written export
+    is never picked up by load_artifact.
+    """
+    model = ImpactModel.from_pickle_data(model_data)
+    forest = model.forest
+    os.makedirs(path, exist_ok=True)
+
+    arrays = {}
+    for name in FOREST_ARRAYS:
+        array = np.ascontiguousarray(getattr(forest, name))
+        np.save(os.path.join(path, name + '.npy'), array, allow_pickle=False)
+        arrays[name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'source': os.path.basename(source),
+        'source_sha256': file_sha256(source),
+        'source_size': os.path.getsize(source),
+        'feature_names': model.feature_names,
+        'vocabularies': {column: sorted(labels, key=labels.get) for column, labels in model.vocabularies.items()},
+        'depth': forest.depth,
+        'arrays': arrays
+    }
+    _write_json(os.path.join(path, MANIFEST_FILE), manifest, indent=2)
+    _write_json(os.path.join(path, VERIFIED_FILE), _source_stat(source))
+    return manifest
+
+
+def load_artifact(path=MODEL_ARTIFACT, source=MODEL_PICKLE):
+    """ImpactModel over read-only memory-mapped arrays.
+
+    The arrays stay in the page cache and are shared by every worker process
+    that maps them, so loading is a manifest read and a stat of `source`
+    (which is not re-hashed while its size and mtime are unchanged). Raises FileNotFoundError if
+    there is no artifact and StaleArtifactError if `source` has changed since
+    the export.
+    """
+    with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise StaleArtifactError(f"{path} has format {manifest.get('format')}, expected {ARTIFACT_FORMAT}")
+    if os.path.exists(source):
+        _check_source(path, manifest, source)
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(path, name + '.npy'), mmap_mode='r', allow_pickle=False)
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise StaleArtifactError(f"{path}/{name}.npy does not match the manifest")
+        arrays[name] = array
+
+    forest = CompiledForest(depth=manifest['depth'], **arrays)
+    return ImpactModel(forest, manifest['feature_names'], manifest['vocabularies'])
@@ -0,0 +1,130 @@
+import numpy as np
+
+# Feature engineering used to build dinosaur_ecosystem_impact_ml_ready.csv, which
+# the forest was trained on: mass = 100 * length^2.5, demand = mass * diet factor,
+# habitat modification = length * type factor
+MASS_COEFFICIENT = 100
+MASS_EXPONENT = 2.5
+DIET_DEMAND_FACTORS = {
+    'carnivorous': 1.5,
+    'herbivorous': 1.0,
+    'omnivorous': 1.2,
+    'unknown': 1.1
+}
+TYPE_HABITAT_FACTORS = {
+    'armoured dinosaur': 2.2,
+    'ceratopsian': 2.0,
+    'euornithopod': 1.5,
+    'large theropod': 2.5,
+    'sauropod': 3.0,
+    'small theropod': 1.0
+}
+ENCODED_COLUMNS = ['diet', 'type', 'geological_period']
+
+
+class CompiledForest:
+    """A regression forest flattened into NumPy node arrays.
+
+    All trees share one set of arrays; `roots` holds each tree's first node and
+    leaves point to themselves, so a prediction is `depth` vectorized steps that
+    advance every tree at once instead of sklearn's per-call validation and
+    thread dispatch.
+    """
+
+    def __init__(self, left, right, feature, threshold, value, roots, depth):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+
+    @classmethod
+    def from_sklearn(cls, model):
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+        return cls(
+            np.concatenate(lefts).astype(np.int32),
+            np.concatenate(rights).astype(np.int32),
+            np.concatenate(features).astype(np.int32),
+            np.concatenate(thresholds).astype(np.float64),
+            np.concatenate(values).astype(np.float64),
+            np.array(roots, dtype=np.int32),
+            depth
+        )
+
+    def predict_one(self, x):
+        """Forest mean for one feature vector"""
+        # sklearn compares float32 features against float64 thresholds
+        x = np.asarray(x, dtype=np.float32).astype(np.float64)
+        nodes = self.roots
+        for _ in range(self.depth):
+            nodes = np.where(x[self.feature[nodes]] <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+        return float(self.value[nodes].mean())
+
+    def predict(self, X):
+        """Forest mean for each row of a 2-D feature matrix"""
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            nodes = np.where(X[rows, self.feature[nodes]] <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=1)
+
+
+class ImpactModel:
+    """The pickled impact regressor: label vocabularies plus the compiled forest"""
+
+    def __init__(self, forest, feature_names, vocabularies):
+        self.forest = forest
+        self.feature_names = list(feature_names)
+        self.vocabularies = {column: {label: i for i, label in enumerate(labels)}
+                             for column, labels in vocabularies.items()}
+
+    @classmethod
+    def from_pickle_data(cls, model_data):
+        """Build from the dict stored in dinosaur_impact_predictor.pkl"""
+        model = model_data['model']
+        vocabularies = {column: list(encoder.classes_) for column, encoder in model_data['encoders'].items()}
+        return cls(CompiledForest.from_sklearn(model), model.feature_names_in_, vocabularies)
+
+    def encode(self, column, label):
+        try:
+            return self.vocabularies[column][label]
+        except KeyError:
+            raise ValueError(f"Unknown {column} '{label}'")
+
+    def features(self, length_m, diet, dino_type, geological_period, start_time_mya, end_time_mya):
+        """Feature vector in the model's feature_names_in_ order, plus the estimated mass"""
+        estimated_mass_kg = MASS_COEFFICIENT * length_m ** MASS_EXPONENT
+        values = {
+            'length_numeric': length_m,
+            'estimated_mass_kg': estimated_mass_kg,
+            'metabolic_demand': estimated_mass_kg * DIET_DEMAND_FACTORS.get(diet, DIET_DEMAND_FACTORS['unknown']),
+            'habitat_modification': length_m * TYPE_HABITAT_FACTORS.get(dino_type, 1.0),
+            'start_time_mya': start_time_mya,
+            'end_time_mya': end_time_mya,
+            'diet_encoded': self.encode('diet', diet),
+            'type_encoded': self.encode('type', dino_type),
+            'geological_period_encoded': self.encode('geological_period', geological_period)
+        }
+        return np.array([values[name] for name in self.feature_names], dtype=np.float64), estimated_mass_kg
+
+    def predict(self, length_m, diet, dino_type, geological_period, start_time_mya, end_time_mya):
+        """(predicted ecosystem impact score, estimated mass in kg)"""
+        x, estimated_mass_kg = self.features(length_m, diet, dino_type, geological_period, start_time_mya, end_time_mya)
+        return self.forest.predict_one(x), estimated_mass_kg
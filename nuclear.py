@@ -1,28 +1,95 @@
 from flask import Flask, jsonify, request, send_from_directory
+import click
 import pickle
-import requests
 import json
 import time
 import random
 import math
-from mapsfeature.maproutes import map_routes
+import functools
+import threading
+import html
+import os
+from concurrent.futures import Future
+from mapsfeature.maproutes import map_routes, precompute_country_counts, send_asset
+from mapsfeature.assets import build_assets, get_manifest
+from httpcompress import init_compression
+from mapsfeature.datastore import CSV_PATH, get_dataset
+from mapsfeature.geometry import GEOJSON_FILE, get_geometry
+from speciesinfo.lookup import SpeciesInfoLookup, fallback_info, prefetch
+from speciesinfo.store import SEED_PATH, SpeciesInfoStore
+from speciesinfo.breaker import CircuitBreaker
 
 app = Flask(__name__)
 # Mount the maps blueprint at /maps so frontend calls /maps/api/...
 app.register_blueprint(map_routes, url_prefix="/maps")
+# gzip/brotli/zstd for JSON and text responses that aren't already encoded
+init_compression(app)
 
 @app.route("/api/world-countries")
 def get_world_countries():
+    # The slimmed, pre-compressed build when `flask --app nuclear build-assets` has run
+    manifest = get_manifest()
+    if manifest is not None and manifest.filename("world_countries.geojson"):
+        return send_asset(manifest, manifest.filename("world_countries.geojson"))
     return send_from_directory(app.static_folder, "world_countries.geojson", mimetype="application/json")
 
-# Load model
+# Load model. NumPy, sklearn and the model files are only touched on first use
+# (engine=ml, /predict/batch) so importing the app stays a cold-start bargain.
+MODEL_PICKLE = 'dinosaur_impact_predictor.pkl'
+
 def load_model():
-    with open('dinosaur_impact_predictor.pkl', 'rb') as f:
+    with open(MODEL_PICKLE, 'rb') as f:
         return pickle.load(f)
 
-model_data = load_model()
-model = model_data['model'] 
-encoders = model_data['encoders']
+def load_impact_model():
+    """The memory-mapped artifact from `flask --app nuclear export-model` if it is current, else the pickle"""
+    from modelfeature.artifact import StaleArtifactError, load_artifact
+    from modelfeature.forest import ImpactModel
+    try:
+        return load_artifact(source=MODEL_PICKLE)
+    except FileNotFoundError:
+        pass
+    except StaleArtifactError as e:
+        app.logger.warning(f"Ignoring model artifact: {e}")
+    return ImpactModel.from_pickle_data(load_model())
+
+_impact_model = None
+_impact_model_lock = threading.Lock()
+
+def get_impact_model():
+    """Forest flattened into NumPy arrays for per-request inference, loaded once on first use"""
+    global _impact_model
+    if _impact_model is None:
+        with _impact_model_lock:
+            if _impact_model is None:
+                _impact_model = load_impact_model()
+    return _impact_model
+
+@app.cli.command('export-model')
+def export_model():
+    """Convert the pickled model into the memory-mapped artifact the app loads at startup."""
+    from modelfeature.artifact import MODEL_ARTIFACT, export_artifact
+    manifest = export_artifact(load_model(), source=MODEL_PICKLE)
+    nodes = manifest['arrays']['left']['shape'][0]
+    click.echo(f"Exported {nodes} forest nodes from {MODEL_PICKLE} -> {MODEL_ARTIFACT}")
+
+# Diet-specific metabolic multipliers (based on modern animals)
+DIET_METABOLIC_FACTORS = {
+    'carnivorous': 2.8,    # High energy needs for hunting
+    'herbivorous': 1.0,    # Baseline for plant processing
+    'omnivorous': 1.8,     # Mixed diet efficiency
+    'unknown': 1.5
+}
+
+# Temporal ecological context by geological period
+PERIOD_FACTORS = {
+    'Late Triassic': 1.2,      # Emerging ecosystems, high impact
+    'Early Jurassic': 1.1,     # Developing complexity
+    'Mid Jurassic': 1.0,       # Stable ecosystems
+    'Late Jurassic': 0.9,      # Mature, diverse ecosystems
+    'Early Cretaceous': 0.95,  # Flowering plant revolution
+    'Late Cretaceous': 0.85    # Peak diversity, stable ecosystems
+}
 
 def predict_dinosaur_impact(length_m, height_m, diet, dino_type, geological_period, start_time_mya, end_time_mya):
     """
@@ -88,15 +155,7 @@ def predict_dinosaur_impact(length_m, height_m, diet, dino_type, geological_peri
     # Based on Kleiber's Law: Metabolic Rate ∝ Mass^0.75
     basal_metabolic_rate = estimated_mass_kg ** 0.75
     
-    # Diet-specific metabolic multipliers (based on modern animals)
-    diet_metabolic_factors = {
-        'carnivorous': 2.8,    # High energy needs for hunting
-        'herbivorous': 1.0,    # Baseline for plant processing
-        'omnivorous': 1.8,     # Mixed diet efficiency
-        'unknown': 1.5
-    }
-    
-    metabolic_demand = basal_metabolic_rate * diet_metabolic_factors.get(diet, 1.5)
+    metabolic_demand = basal_metabolic_rate * DIET_METABOLIC_FACTORS.get(diet, 1.5)
     
     # STEP 3: HABITAT IMPACT CALCULATION
     # Based on home range requirements from modern megafauna
@@ -146,16 +205,7 @@ def predict_dinosaur_impact(length_m, height_m, diet, dino_type, geological_peri
         niche_breadth = 2.0  # Medium - smaller prey, less system-wide impact
     
     # STEP 6: TEMPORAL ECOLOGICAL CONTEXT
-    period_factors = {
-        'Late Triassic': 1.2,      # Emerging ecosystems, high impact
-        'Early Jurassic': 1.1,     # Developing complexity
-        'Mid Jurassic': 1.0,       # Stable ecosystems
-        'Late Jurassic': 0.9,      # Mature, diverse ecosystems
-        'Early Cretaceous': 0.95,  # Flowering plant revolution
-        'Late Cretaceous': 0.85    # Peak diversity, stable ecosystems
-    }
-    
-    ecological_context = period_factors.get(geological_period, 1.0)
+    ecological_context = PERIOD_FACTORS.get(geological_period, 1.0)
     
     # STEP 7: FINAL IMPACT SCORE CALCULATION
     # Combines all ecological factors into a 0-100 score
@@ -198,63 +248,247 @@ def predict_dinosaur_impact(length_m, height_m, diet, dino_type, geological_peri
         'estimated_mass': round(estimated_mass_kg, 0)
     }
 
-def get_dinosaur_info(dino_name):
-    """Enhanced dinosaur info with Wikipedia API + fallback"""
-    try:
-        clean_name = dino_name.strip().replace(' ', '_')
-        api_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{clean_name}"
-        headers = {'User-Agent': 'JurassicImpactPredictor/1.0'}
-        
-        response = requests.get(api_url, headers=headers, timeout=8)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'extract' in data and len(data.get('extract', '')) > 50:
-                return {
-                    'name': data.get('title', dino_name),
-                    'description': data.get('extract', ''),
-                    'image_url': data.get('thumbnail', {}).get('source', ''),
-                    'wiki_url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
-                    'source': 'wikipedia'
-                }
-    except:
-        pass
-    
-    # Enhanced fallback database
-    fallback_data = {
-        'tyrannosaurus rex': {
-            'name': 'Tyrannosaurus Rex',
-            'description': 'Tyrannosaurus rex was one of the largest land predators ever known, reaching lengths of 12-13 meters and weighing 7-9 tons. This massive theropod lived during the Late Cretaceous period.',
-            'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/6/6f/T-rex_skull_Field_Museum.jpg/300px-T-rex_skull_Field_Museum.jpg',
-            'wiki_url': 'https://en.wikipedia.org/wiki/Tyrannosaurus'
-        },
-        'triceratops': {
-            'name': 'Triceratops', 
-            'description': 'Triceratops was a large herbivorous ceratopsid dinosaur weighing 6-12 tons, known for its distinctive three-horned skull and large bony frill.',
-            'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/c/c7/Triceratops_BW.jpg/300px-Triceratops_BW.jpg',
-            'wiki_url': 'https://en.wikipedia.org/wiki/Triceratops'
-        },
-        'brontosaurus': {
-            'name': 'Brontosaurus',
-            'description': 'Brontosaurus was a genus of sauropod dinosaurs reaching 20-22 meters in length and weighing 15-20 tons. Despite its massive size, it was a gentle herbivore that browsed on high vegetation.',
-            'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/b/bb/Brontosaurus_by_Tom_Parker.jpg/300px-Brontosaurus_by_Tom_Parker.jpg',
-            'wiki_url': 'https://en.wikipedia.org/wiki/Brontosaurus'
-        }
+# Memoized predictions: the predictor page keeps resubmitting the same slider values
+PREDICTION_CACHE_SIZE = 4096
+PREDICTION_KEY_DECIMALS = 3  # float inputs closer than this are treated as equal
+
+@functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _cached_prediction(*key):
+    return predict_dinosaur_impact(*key)
+
+def predict_dinosaur_impact_cached(length_m, height_m, diet, dino_type, geological_period, start_time_mya, end_time_mya):
+    """predict_dinosaur_impact behind a bounded LRU cache keyed on the quantized inputs"""
+    result = _cached_prediction(
+        round(float(length_m), PREDICTION_KEY_DECIMALS),
+        round(float(height_m), PREDICTION_KEY_DECIMALS),
+        diet,
+        dino_type,
+        geological_period,
+        round(float(start_time_mya), PREDICTION_KEY_DECIMALS),
+        round(float(end_time_mya), PREDICTION_KEY_DECIMALS)
+    )
+    return dict(result)  # callers get their own copy of the shared cached dict
+
+def prediction_cache_stats():
+    info = _cached_prediction.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0
     }
+
+# Per-type mass scaling for the batch predictor: (coefficient, femur exponent, height exponent).
+# Mirrors the branches in STEP 1 of predict_dinosaur_impact.
+TYPE_MASS_SCALING = {
+    'sauropod': (2.4, 2.6, 0.4),
+    'large theropod': (3.2, 2.7, 0.6),
+    'small theropod': (1.8, 2.5, 0.5),
+    'ceratopsian': (2.8, 2.6, 0.55),
+    'armoured dinosaur': (3.0, 2.65, 0.5),
+    'euornithopod': (2.2, 2.55, 0.5)
+}
+DEFAULT_MASS_SCALING = (2.5, 2.6, 0.5)
+
+# Niche breadth by type (STEP 5), small theropods and unknown types use 2.0
+TYPE_NICHE_BREADTH = {
+    'sauropod': 2.8,
+    'large theropod': 3.5,
+    'ceratopsian': 2.2,
+    'armoured dinosaur': 1.8,
+    'euornithopod': 2.4
+}
+
+IMPACT_CATEGORIES = [
+    (20, "Minimal Impact", "🟢", "#00ff88"),
+    (40, "Low Impact", "🟡", "#ffaa00"),
+    (65, "Moderate Impact", "🟠", "#ff6600"),
+    (85, "High Impact", "🔴", "#ff4400"),
+    (None, "Extreme Impact", "💀", "#ff0000")
+]
+
+BATCH_COLUMNS = ['length', 'height', 'diet', 'type', 'period', 'start_time', 'end_time']
+NUMERIC_BATCH_COLUMNS = ['length', 'height', 'start_time', 'end_time']
+
+def _lookup(codes, labels, table, default):
+    """Per-row table values for label codes from _encode (unknown labels get default)"""
+    import numpy as np
+    return np.array([table.get(label, default) for label in labels] + [default], dtype=float)[codes]
+
+def _encode(values, labels):
+    """Index of each value in labels, len(labels) for anything else"""
+    import numpy as np
+    codes = np.full(len(values), len(labels))
+    for i, label in enumerate(labels):
+        codes[values == label] = i
+    return codes
+
+def _round_like_python(values, ndigits):
+    """np.round, except near-ties are re-rounded with round() so results equal the scalar path"""
+    import numpy as np
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9)
+    for i in ties:
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+def predict_dinosaur_impact_batch(columns):
+    """
+    Vectorized predict_dinosaur_impact over many dinosaurs at once.
+    `columns` is a DataFrame or a dict of equal-length sequences keyed by BATCH_COLUMNS
+    (the same field names /predict accepts). Returns a dict of NumPy arrays with the
+    scalar result keys; every value matches predict_dinosaur_impact exactly.
+    """
+    import numpy as np  # deferred with the rest of the model stack
+    
+    length_m = np.asarray(columns['length'], dtype=float)
+    height_m = np.asarray(columns['height'], dtype=float)
+    diet = np.asarray(columns['diet'], dtype=str)
+    dino_type = np.asarray(columns['type'], dtype=str)
+    
+    type_labels = list(TYPE_MASS_SCALING)
+    type_codes = _encode(dino_type, type_labels)
+    diet_labels = list(DIET_METABOLIC_FACTORS)
+    diet_codes = _encode(diet, diet_labels)
+    period_labels = list(PERIOD_FACTORS)
+    period_codes = _encode(np.asarray(columns['period'], dtype=str), period_labels)
     
-    dino_key = dino_name.lower().strip()
-    if dino_key in fallback_data:
-        fallback_data[dino_key]['source'] = 'database'
-        return fallback_data[dino_key]
+    # STEP 1: MASS ESTIMATION
+    estimated_femur_circ = length_m * 0.08
+    scaling = np.array([TYPE_MASS_SCALING[label] for label in type_labels] + [DEFAULT_MASS_SCALING])[type_codes]
+    base_mass = scaling[:, 0] * (estimated_femur_circ ** scaling[:, 1]) * (height_m ** scaling[:, 2]) * 1000
+    
+    sauropod = type_codes == type_labels.index('sauropod')
+    base_mass = np.where(sauropod & (length_m > 25), base_mass * 1.3,
+                np.where(sauropod & (length_m > 20), base_mass * 1.1, base_mass))
+    
+    base_mass = np.where(base_mass > 50000, 50000 + (base_mass - 50000) * 0.3,
+                np.where(base_mass > 30000, 30000 + (base_mass - 30000) * 0.6, base_mass))
+    estimated_mass_kg = np.where(base_mass < 50, 50.0, base_mass)
+    
+    # STEP 2: METABOLIC DEMAND
+    metabolic_demand = estimated_mass_kg ** 0.75 * _lookup(diet_codes, diet_labels, DIET_METABOLIC_FACTORS, 1.5)
+    
+    # STEP 3: HABITAT IMPACT
+    carnivorous = diet_codes == diet_labels.index('carnivorous')
+    herbivorous = diet_codes == diet_labels.index('herbivorous')
+    home_range_factor = np.where(carnivorous, estimated_mass_kg ** 0.75 * 0.02,
+                        np.where(herbivorous, estimated_mass_kg ** 0.65 * 0.008,
+                                 estimated_mass_kg ** 0.7 * 0.015))
+    competition_intensity = np.where(carnivorous, 3.5, np.where(herbivorous, 1.8, 2.5))
+    
+    # STEP 4: CARRYING CAPACITY
+    capacity_numerator = np.select(
+        [estimated_mass_kg > 20000, estimated_mass_kg > 10000, estimated_mass_kg > 5000, estimated_mass_kg > 1000],
+        [2000, 3000, 4000, 5000],
+        6000
+    )
+    carrying_capacity = capacity_numerator / (estimated_mass_kg ** 0.6)
+    
+    # STEP 5 & 6: NICHE BREADTH AND TEMPORAL CONTEXT
+    niche_breadth = _lookup(type_codes, type_labels, TYPE_NICHE_BREADTH, 2.0)
+    ecological_context = _lookup(period_codes, period_labels, PERIOD_FACTORS, 1.0)
+    
+    # STEP 7: FINAL SCORE
+    resource_index = np.minimum(30, (metabolic_demand / 10000) * ecological_context)
+    habitat_index = np.minimum(25, (home_range_factor / 1000) * niche_breadth)
+    competition_index = np.minimum(25, competition_intensity * (1 / carrying_capacity) * 1000)
+    stability_index = np.minimum(20, (niche_breadth * 5) + (ecological_context * 10))
+    raw_impact = resource_index + habitat_index + competition_index + stability_index
+    impact_score = np.minimum(100, np.maximum(5, raw_impact * 1.2))
+    
+    # CATEGORIZATION
+    thresholds = [limit for limit, *_ in IMPACT_CATEGORIES[:-1]]
+    category_index = np.searchsorted(thresholds, impact_score, side='right')
+    labels = np.array([label for _, label, _, _ in IMPACT_CATEGORIES], dtype=object)
+    emojis = np.array([emoji for _, _, emoji, _ in IMPACT_CATEGORIES], dtype=object)
+    colors = np.array([color for _, _, _, color in IMPACT_CATEGORIES], dtype=object)
     
     return {
-        'name': dino_name.title(),
-        'description': f'{dino_name} was a dinosaur that lived during the Mesozoic Era.',
-        'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/d/d3/Dinosaur_silhouettes.png/300px-Dinosaur_silhouettes.png',
-        'wiki_url': f"https://en.wikipedia.org/wiki/{dino_name.replace(' ', '_')}",
-        'source': 'fallback'
+        'score': _round_like_python(impact_score, 1),
+        'category': labels[category_index],
+        'emoji': emojis[category_index],
+        'color': colors[category_index],
+        'estimated_mass': np.round(estimated_mass_kg, 0)
     }
 
+def impact_category(score):
+    """(category, emoji, color) for an impact score"""
+    for limit, category, emoji, color in IMPACT_CATEGORIES:
+        if limit is None or score < limit:
+            return category, emoji, color
+
+def predict_dinosaur_impact_ml(length_m, height_m, diet, dino_type, geological_period, start_time_mya, end_time_mya):
+    """Score from the trained RandomForest instead of the formula; raises ValueError for labels it never saw"""
+    # The forest was trained without height, it is accepted for signature parity
+    score, estimated_mass_kg = get_impact_model().predict(length_m, diet, dino_type, geological_period, start_time_mya, end_time_mya)
+    category, emoji, color = impact_category(score)
+    return {
+        'score': round(score, 1),
+        'category': category,
+        'emoji': emoji,
+        'color': color,
+        'estimated_mass': round(estimated_mass_kg, 0),
+        'engine': 'ml'
+    }
+
+PREDICTION_ENGINES = {
+    'formula': predict_dinosaur_impact_cached,
+    'ml': predict_dinosaur_impact_ml
+}
+
+def prediction_engine(data):
+    """Predictor chosen by ?engine= or the JSON "engine" field, formula by default"""
+    name = request.args.get('engine') or data.get('engine') or 'formula'
+    if name not in PREDICTION_ENGINES:
+        raise ValueError(f"Unknown engine '{name}', expected one of: {', '.join(PREDICTION_ENGINES)}")
+    return PREDICTION_ENGINES[name]
+
+# Shared Wikipedia lookup layer: TTL cache, coalesced fetches, pooled session, backed
+# by a runtime on-disk store over the committed seed that `flask --app nuclear
+# warm-species-cache` builds, so cold starts answer from disk. The breaker
+# counts any fetch slower than the request budget as a failure, so an upstream too slow
+# to ever answer in time trips it instead of costing every caller the full wait
+SPECIES_LOOKUP_BUDGET = 1.5  # seconds a request waits on Wikipedia
+species_lookup = SpeciesInfoLookup(budget=SPECIES_LOOKUP_BUDGET, store=SpeciesInfoStore(seed=SpeciesInfoStore(SEED_PATH)),
+                                   breaker=CircuitBreaker(latency_budget=SPECIES_LOOKUP_BUDGET))
+
+@app.cli.command('warm-species-cache')
+@click.option('--workers', default=8, show_default=True, help='Concurrent Wikipedia requests.')
+@click.option('--refresh', is_flag=True, help='Re-fetch names that are already stored.')
+def warm_species_cache(workers, refresh):
+    """Prefetch species info for every name in the fossil CSV into the seed store.
+
+    Commit the resulting speciesinfo/species_info.seed.sqlite3: deploys ship it and
+    serve every known species without calling Wikipedia.
+    """
+    names = get_dataset().df['name'].astype(str).tolist()
+    seed_lookup = SpeciesInfoLookup(store=SpeciesInfoStore(SEED_PATH), workers=workers)
+    start = time.perf_counter()
+    summary = prefetch(seed_lookup, names, workers=workers, refresh=refresh)
+    click.echo(f"{summary} in {time.perf_counter() - start:.1f}s -> {SEED_PATH}")
+
+@app.cli.command('build-assets')
+def build_static_assets():
+    """Write content-hashed, pre-compressed copies of the map's JS, CSS and world GeoJSON."""
+    for name, asset in build_assets().items():
+        sizes = ', '.join(f"{encoding} {size / 1024:.0f} KB" for encoding, size in asset['sizes'].items())
+        click.echo(f"{name} -> {asset['file']} ({sizes})")
+
+@app.cli.command('build-fossil-cache')
+def build_fossil_cache():
+    """Convert the fossil CSV into the memory-mapped columnar cache get_dataset() prefers."""
+    from mapsfeature.columnar import build_columnar, columnar_path
+    manifest = build_columnar(CSV_PATH)
+    click.echo(f"Cached {manifest['rows']} rows x {len(manifest['columns'])} columns -> {columnar_path(CSV_PATH)}")
+
+def get_dinosaur_info(dino_name):
+    """Enhanced dinosaur info with Wikipedia API + fallback"""
+    return species_lookup.get(dino_name)
+
 # LOGO SERVING ROUTE
 @app.route('/jurassic-logo.png')
 def serve_logo():
@@ -263,17 +497,86 @@ def serve_logo():
 @app.route('/predict', methods=['POST'])
 def predict():
     data = request.json
-    result = predict_dinosaur_impact(
-        float(data['length']),
-        float(data['height']),
-        data['diet'],
-        data['type'],
-        data['period'],
-        float(data['start_time']),
-        float(data['end_time'])
-    )
+    try:
+        result = prediction_engine(data)(
+            float(data['length']),
+            float(data['height']),
+            data['diet'],
+            data['type'],
+            data['period'],
+            float(data['start_time']),
+            float(data['end_time'])
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     return jsonify(result)
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Score many dinosaurs in one call.
+    Accepts columnar JSON ({"length": [...], "height": [...], ...}) or {"dinosaurs": [{...}, ...]}."""
+    data = request.json or {}
+    if 'dinosaurs' in data:
+        dinosaurs = data['dinosaurs']
+        if not isinstance(dinosaurs, list) or not all(isinstance(dino, dict) for dino in dinosaurs):
+            return jsonify({'error': "'dinosaurs' must be a list of objects"}), 400
+        data = {column: [dino.get(column) for dino in dinosaurs] for column in BATCH_COLUMNS}
+    
+    missing = [column for column in BATCH_COLUMNS if column not in data]
+    if missing:
+        return jsonify({'error': f"Missing columns: {', '.join(missing)}"}), 400
+    not_lists = [column for column in BATCH_COLUMNS if not isinstance(data[column], list)]
+    if not_lists:
+        return jsonify({'error': f"Columns must be lists: {', '.join(not_lists)}"}), 400
+    if len({len(data[column]) for column in BATCH_COLUMNS}) > 1:
+        return jsonify({'error': 'All columns must have the same length'}), 400
+    
+    # Missing or non-finite values would come back as NaN scores, which are not valid JSON
+    import numpy as np
+    for column in BATCH_COLUMNS:
+        if None in data[column]:
+            return jsonify({'error': f"Missing value for '{column}' at index {data[column].index(None)}"}), 400
+        if column not in NUMERIC_BATCH_COLUMNS and not all(isinstance(value, str) for value in data[column]):
+            return jsonify({'error': f"'{column}' must hold only strings"}), 400
+    for column in NUMERIC_BATCH_COLUMNS:
+        try:
+            values = np.asarray(data[column], dtype=float)
+            if values.ndim != 1:
+                raise ValueError(column)
+        except (TypeError, ValueError):
+            return jsonify({'error': f"'{column}' must hold only numbers"}), 400
+        bad = np.flatnonzero(~np.isfinite(values))
+        if bad.size:
+            return jsonify({'error': f"'{column}' at index {bad[0]} must be a finite number"}), 400
+        if column == 'length' and (values <= 0).any():
+            return jsonify({'error': f"'length' at index {np.flatnonzero(values <= 0)[0]} must be positive"}), 400
+        if column == 'height' and (values < 0).any():
+            return jsonify({'error': f"'height' at index {np.flatnonzero(values < 0)[0]} must not be negative"}), 400
+    
+    try:
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            results = predict_dinosaur_impact_batch(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f"Invalid input: {str(e)}"}), 400
+    
+    # Extreme but finite inputs can still overflow the mass estimate
+    finite = np.ones(len(data['length']), dtype=bool)
+    for values in results.values():
+        if values.dtype.kind == 'f':
+            finite &= np.isfinite(values)
+    bad = np.flatnonzero(~finite)
+    if bad.size:
+        return jsonify({'error': f"Inputs at index {bad[0]} are out of range: the prediction is not finite"}), 400
+    
+    return jsonify({
+        'count': len(data['length']),
+        'results': {key: values.tolist() for key, values in results.items()}
+    })
+
+@app.route('/predict/cache-stats')
+def predict_cache_stats():
+    return jsonify(prediction_cache_stats())
+
 @app.route('/dinosaur-info', methods=['POST'])
 def dinosaur_info():
     data = request.json
@@ -281,21 +584,114 @@ def dinosaur_info():
     info = get_dinosaur_info(dino_name)
     return jsonify(info)
 
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    """Prediction plus species info in one round trip; the info lookup runs while the score is computed"""
+    data = request.json
+    try:
+        # Validated before the lookup starts, so a bad request leaves nothing running
+        args = (
+            float(data['length']),
+            float(data['height']),
+            data['diet'],
+            data['type'],
+            data['period'],
+            float(data['start_time']),
+            float(data['end_time'])
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    dino_name = data.get('name', '').strip()
+    pending_info = species_lookup.begin(dino_name) if dino_name else None
+    result = predict_dinosaur_impact_cached(*args)
+    
+    info = species_lookup.finish(dino_name, pending_info) if dino_name else None
+    return jsonify({'prediction': result, 'info': info})
+
+MAX_BATCH_NAMES = 100
+
+@app.route('/dinosaur-info/batch', methods=['POST'])
+def dinosaur_info_batch():
+    """Species info for a list of names: {"names": [...]} -> {"results": {name: info}}"""
+    data = request.json or {}
+    names = data.get('names', [])
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return jsonify({'error': "'names' must be a list of strings"}), 400
+    if len(names) > MAX_BATCH_NAMES:
+        return jsonify({'error': f"At most {MAX_BATCH_NAMES} names per request"}), 400
+    
+    start = time.perf_counter()
+    results = species_lookup.get_many(names)
+    return jsonify({
+        'results': results,
+        'unique_names': len({name.strip().lower() for name in names}),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
+    })
+
+@app.route('/dinosaur-info/stats')
+def dinosaur_info_stats():
+    """Lookup cache counters and circuit breaker state for monitoring"""
+    return jsonify({
+        'lookup': dict(species_lookup.stats),
+        'breaker': species_lookup.breaker.snapshot()
+    })
+
+# Warmup for the production entry point (wsgi.py): every lazily loaded resource is
+# built once in the master process, so forked workers start with it already in memory
+WARMUP_STATE = {'ready': False, 'timings_ms': {}, 'map_views': None, 'errors': {}}
+
+def warm_up():
+    """Load the dataset and its indexes, the parsed world geometry, every dropdown map view, the model and the map template"""
+    steps = [
+        ('dataset', get_dataset),
+        ('geometry', lambda: get_geometry(os.path.join(app.static_folder, GEOJSON_FILE))),
+        ('map_views', lambda: WARMUP_STATE.update(map_views=precompute_country_counts(app))),
+        ('model', get_impact_model),
+        ('templates', lambda: app.jinja_env.get_template('map.html'))
+    ]
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            # Not fatal: that resource still loads lazily, the other steps still run
+            # and readiness stays false
+            WARMUP_STATE['errors'][name] = str(e)
+            app.logger.exception(f"Warmup step '{name}' failed")
+            continue
+        WARMUP_STATE['timings_ms'][name] = round((time.perf_counter() - start) * 1000, 1)
+    WARMUP_STATE['ready'] = not WARMUP_STATE['errors']
+    if WARMUP_STATE['ready']:
+        app.logger.info(f"Warmup complete: {WARMUP_STATE['timings_ms']}")
+    else:
+        app.logger.warning(f"Warmup finished with failed steps: {', '.join(WARMUP_STATE['errors'])}")
+    return WARMUP_STATE
+
+@app.route('/ready')
+def readiness():
+    """200 once warm_up() has finished, 503 before that (or if it failed)"""
+    return jsonify(WARMUP_STATE), 200 if WARMUP_STATE['ready'] else 503
+
 @app.route('/compare', methods=['POST'])
 def compare_dinosaurs():
     data = request.json
     dino1 = data.get('dino1', {})
     dino2 = data.get('dino2', {})
     
-    result1 = predict_dinosaur_impact(
-        float(dino1['length']), float(dino1['height']), dino1['diet'],
-        dino1['type'], dino1['period'], float(dino1['start_time']), float(dino1['end_time'])
-    )
-    
-    result2 = predict_dinosaur_impact(
-        float(dino2['length']), float(dino2['height']), dino2['diet'],
-        dino2['type'], dino2['period'], float(dino2['start_time']), float(dino2['end_time'])
-    )
+    try:
+        predict_impact = prediction_engine(data)
+        result1 = predict_impact(
+            float(dino1['length']), float(dino1['height']), dino1['diet'],
+            dino1['type'], dino1['period'], float(dino1['start_time']), float(dino1['end_time'])
+        )
+        
+        result2 = predict_impact(
+            float(dino2['length']), float(dino2['height']), dino2['diet'],
+            dino2['type'], dino2['period'], float(dino2['start_time']), float(dino2['end_time'])
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'dino1': {**dino1, **result1},
@@ -304,9 +700,7 @@ def compare_dinosaurs():
     })
 
 # MAIN PAGE WITH ENHANCED SUMMARY BOX
-@app.route('/')
-def index():
-    return """
+INDEX_PAGE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1169,20 +1563,14 @@ def index():
                 </div>
                 
                 <div class="dino-search">
-                    <input type="text" id="search-input" placeholder="Search any dinosaur (e.g., Brontosaurus, Carnotaurus, Amargasaurus)..." class="search-input">
+                    <input type="text" id="search-input" value="Tyrannosaurus Rex" placeholder="Search any dinosaur (e.g., Brontosaurus, Carnotaurus, Amargasaurus)..." class="search-input">
                     <button type="button" id="search-btn" class="arcade-button search-btn">
                         <i class="fas fa-search"></i>
                         <span>SEARCH INFO</span>
                     </button>
                 </div>
 
-                <div id="dino-info-display" class="dino-info-content">
-                    <div class="no-info">
-                        <i class="fas fa-search" style="font-size: 3rem; color: var(--text-secondary); margin-bottom: 20px;"></i>
-                        <p>Search for any dinosaur to view detailed information and images!<br>
-                        <small style="color: var(--jp-yellow);">Enhanced with scientifically accurate mass calculations!</small></p>
-                    </div>
-                </div>
+                <div id="dino-info-display" class="dino-info-content"><!-- DEFAULT_SPECIES_CARD --></div>
             </div>
         </section>
     </div>
@@ -1385,6 +1773,7 @@ def index():
                 button.disabled = true;
 
                 const formData = {
+                    name: document.getElementById('name').value.trim(),
                     length: parseFloat(document.getElementById('length').value),
                     height: parseFloat(document.getElementById('height').value),
                     diet: document.getElementById('diet').value,
@@ -1395,13 +1784,14 @@ def index():
                 };
 
                 try {
-                    const response = await fetch('/predict', {
+                    const response = await fetch('/analyze', {
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify(formData)
                     });
 
-                    const result = await response.json();
+                    const analysis = await response.json();
+                    const result = analysis.prediction;
                     
                     document.getElementById('impact-score').textContent = result.score;
                     document.getElementById('impact-category').textContent = result.category;
@@ -1425,9 +1815,9 @@ def index():
                     localStorage.setItem('predictions', count);
                     counter.textContent = count.toString().padStart(3, '0');
 
-                    if (document.getElementById('name').value.trim()) {
-                        searchInput.value = document.getElementById('name').value.trim();
-                        setTimeout(searchDinosaurInfo, 1500);
+                    if (analysis.info) {
+                        searchInput.value = formData.name;
+                        displayDinosaurInfo(analysis.info);
                     }
 
                 } catch (error) {
@@ -1441,18 +1831,75 @@ def index():
             // Load saved prediction count
             const savedCount = localStorage.getItem('predictions') || '0';
             document.getElementById('total-predictions').textContent = savedCount.padStart(3, '0');
-
-            // Auto-search on load
-            setTimeout(() => {
-                searchInput.value = 'Tyrannosaurus Rex';
-                searchDinosaurInfo();
-            }, 1000);
         });
     </script>
 </body>
 </html>
     """
 
+# Default encyclopedia card, rendered server-side into the index page so a page
+# load needs no /dinosaur-info call; refreshed in the background every DEFAULT_CARD_TTL
+DEFAULT_SPECIES = 'Tyrannosaurus Rex'
+DEFAULT_CARD_TTL = 3600
+DEFAULT_CARD_MARKER = '<!-- DEFAULT_SPECIES_CARD -->'
+SOURCE_TEXT = {
+    'wikipedia': 'Source: Wikipedia API',
+    'wikipedia_alt': 'Source: Wikipedia (alternate)',
+    'database': 'Source: Enhanced Database',
+    'fallback': 'Source: Backup Database'
+}
+
+_default_card = {'html': None, 'refresh_at': 0.0}
+_default_card_lock = threading.Lock()
+
+def render_species_card(info):
+    """Server-side twin of displayDinosaurInfo() in the index page script"""
+    wiki_link = ''
+    if info.get('wiki_url'):
+        wiki_link = f"""<a href="{html.escape(info['wiki_url'])}" target="_blank" class="dino-link">
+                            <i class="fas fa-external-link-alt"></i>
+                            Learn more on Wikipedia
+                        </a>"""
+    return f"""
+                    <img src="{html.escape(info.get('image_url', ''))}" alt="{html.escape(info['name'])}" class="dino-image" 
+                         onerror="this.src='https://upload.wikimedia.org/wikipedia/commons/thumb/d/d3/Dinosaur_silhouettes.png/300px-Dinosaur_silhouettes.png';">
+                    <div class="dino-details">
+                        <div class="dino-name">{html.escape(info['name'])}</div>
+                        <div class="dino-description">{html.escape(info.get('description', ''))}</div>
+                        <div class="search-status">{SOURCE_TEXT.get(info.get('source'), 'Source: Database')}</div>
+                        {wiki_link}
+                    </div>
+                """
+
+def _on_default_card_fetched(future):
+    info = future.result()
+    if info is not None:
+        _default_card['html'] = render_species_card(info)
+
+def default_species_card():
+    """Current default card HTML; never waits on Wikipedia"""
+    with _default_card_lock:
+        now = time.monotonic()
+        if _default_card['html'] is None:
+            pending = species_lookup.begin(DEFAULT_SPECIES)
+            info = fallback_info(DEFAULT_SPECIES) if isinstance(pending, Future) else pending
+            _default_card['html'] = render_species_card(info)
+            _default_card['refresh_at'] = now + DEFAULT_CARD_TTL
+            if isinstance(pending, Future):
+                # Cold cache: the fallback is in place first, so the fetched record
+                # replaces it even when the fetch has already finished
+                pending.add_done_callback(_on_default_card_fetched)
+        elif now >= _default_card['refresh_at']:
+            _default_card['refresh_at'] = now + DEFAULT_CARD_TTL
+            pending = species_lookup.submit(DEFAULT_SPECIES)
+            if pending is not None:
+                pending.add_done_callback(_on_default_card_fetched)
+        return _default_card['html']
+
+@app.route('/')
+def index():
+    return INDEX_PAGE.replace(DEFAULT_CARD_MARKER, default_species_card(), 1)
+
 # H2H PAGE WITHOUT HOME BUTTON
 @app.route('/h2h')
 def h2h_page():
@@ -0,0 +1,93 @@
+import time
+import threading
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for the upstream species lookups.
+
+    The outcomes of the last `window` calls are tracked; calls slower than
+    `latency_budget` seconds count as failures; keep it at or below the
+    lookup's own wait budget, or calls that always overrun it never trip. Once at least `min_calls` have
+    been seen and the failure rate reaches `failure_rate`, the breaker opens
+    and callers are refused immediately. After `reset_timeout` seconds one
+    probe call is let through (half-open): success closes the breaker, failure
+    opens it again.
+    """
+
+    def __init__(self, window=20, min_calls=5, failure_rate=0.5, reset_timeout=30, latency_budget=1.5):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.latency_budget = latency_budget
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True for a failed call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """Whether a call may go upstream now; in half-open state only a single probe is allowed"""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record(self, duration, failed=False):
+        """Report the outcome of an allowed call"""
+        failed = failed or duration > self.latency_budget
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._trip()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        self._outcomes.clear()
+
+    def snapshot(self):
+        """Breaker state for monitoring"""
+        with self._lock:
+            failures = sum(self._outcomes)
+            return {
+                'state': self._state,
+                'recent_calls': len(self._outcomes),
+                'recent_failures': failures,
+                'failure_rate': round(failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+                'times_opened': self._times_opened,
+                'rejected_calls': self._rejected,
+                'retry_in': round(max(0.0, self._opened_at + self.reset_timeout - time.monotonic()), 1)
+                            if self._state == OPEN else 0.0,
+                'latency_budget': self.latency_budget
+            }
@@ -0,0 +1,278 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+log = logging.getLogger("speciesinfo")
+
+WIKIPEDIA_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+USER_AGENT = 'JurassicImpactPredictor/1.0'
+
+# Enhanced fallback database
+FALLBACK_DATA = {
+    'tyrannosaurus rex': {
+        'name': 'Tyrannosaurus Rex',
+        'description': 'Tyrannosaurus rex was one of the largest land predators ever known, reaching lengths of 12-13 meters and weighing 7-9 tons. This massive theropod lived during the Late Cretaceous period.',
+        'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/6/6f/T-rex_skull_Field_Museum.jpg/300px-T-rex_skull_Field_Museum.jpg',
+        'wiki_url': 'https://en.wikipedia.org/wiki/Tyrannosaurus'
+    },
+    'triceratops': {
+        'name': 'Triceratops', 
+        'description': 'Triceratops was a large herbivorous ceratopsid dinosaur weighing 6-12 tons, known for its distinctive three-horned skull and large bony frill.',
+        'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/c/c7/Triceratops_BW.jpg/300px-Triceratops_BW.jpg',
+        'wiki_url': 'https://en.wikipedia.org/wiki/Triceratops'
+    },
+    'brontosaurus': {
+        'name': 'Brontosaurus',
+        'description': 'Brontosaurus was a genus of sauropod dinosaurs reaching 20-22 meters in length and weighing 15-20 tons. Despite its massive size, it was a gentle herbivore that browsed on high vegetation.',
+        'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/b/bb/Brontosaurus_by_Tom_Parker.jpg/300px-Brontosaurus_by_Tom_Parker.jpg',
+        'wiki_url': 'https://en.wikipedia.org/wiki/Brontosaurus'
+    }
+}
+
+
+def cache_key(dino_name):
+    return dino_name.strip().lower()
+
+
+def fallback_info(dino_name):
+    """Local record used whenever Wikipedia has nothing (or is too slow)"""
+    dino_key = cache_key(dino_name)
+    if dino_key in FALLBACK_DATA:
+        return {**FALLBACK_DATA[dino_key], 'source': 'database'}
+    
+    return {
+        'name': dino_name.title(),
+        'description': f'{dino_name} was a dinosaur that lived during the Mesozoic Era.',
+        'image_url': 'https://upload.wikimedia.org/wikipedia/commons/thumb/d/d3/Dinosaur_silhouettes.png/300px-Dinosaur_silhouettes.png',
+        'wiki_url': f"https://en.wikipedia.org/wiki/{dino_name.replace(' ', '_')}",
+        'source': 'fallback'
+    }
+
+
+def make_session(pool_size=16):
+    """Shared keep-alive session so lookups reuse pooled connections"""
+    # requests is imported on first use so importing the app stays cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class SpeciesInfoLookup:
+    """Cached, coalesced Wikipedia summary lookups with a latency budget.
+
+    Hits (and misses, as None) are cached with a TTL. Misses in the persistent
+    store expire after negative_ttl, so an odd upstream answer is retried;
+    stored summaries are always served, and one older than store_ttl is
+    refreshed in the background. Concurrent requests for
+    the same name share one upstream fetch. A caller waits at most `budget`
+    seconds; past that it gets the local fallback while the fetch finishes in
+    the background and fills the cache for the next request.
+    """
+
+    def __init__(self, base_url=WIKIPEDIA_SUMMARY_URL, timeout=3, budget=1.5,
+                 ttl=24 * 3600, negative_ttl=600, store_ttl=30 * 24 * 3600, max_entries=2048, workers=8, store=None, breaker=None):
+        self.base_url = base_url
+        self.store_backend = store
+        self.breaker = breaker
+        self.timeout = timeout
+        self.budget = budget
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.store_ttl = store_ttl
+        self.max_entries = max_entries
+        self.workers = workers
+        self._session = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='speciesinfo')
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()   # key -> (expires_at, info or None)
+        self._inflight = {}           # key -> Future
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'budget_exceeded': 0, 'errors': 0,
+                      'short_circuited': 0}
+
+    @property
+    def session(self):
+        """The pooled HTTP session, created on the first upstream call"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = make_session(self.workers)
+        return self._session
+
+    def fetch(self, dino_name):
+        """One upstream call: the Wikipedia record, or None when there is no usable summary.
+        Raises on transport errors, throttling and server errors."""
+        clean_name = dino_name.strip().replace(' ', '_')
+        response = self.session.get(self.base_url + clean_name, timeout=self.timeout)
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            from requests import HTTPError
+            raise HTTPError(f"{response.status_code} from upstream", response=response)
+        if response.status_code == 200:
+            data = response.json()
+            if 'extract' in data and len(data.get('extract', '')) > 50:
+                return {
+                    'name': data.get('title', dino_name),
+                    'description': data.get('extract', ''),
+                    'image_url': data.get('thumbnail', {}).get('source', ''),
+                    'wiki_url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
+                    'source': 'wikipedia'
+                }
+        return None
+
+    def cached(self, dino_name):
+        """(found, info) from memory or the persistent store, without waiting on the network"""
+        key = cache_key(dino_name)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._cache.move_to_end(key)
+                return True, entry[1]
+            if entry is not None:
+                del self._cache[key]
+
+        if self.store_backend is None:
+            return False, None
+        found, info, age = self.store_backend.get(key, self.negative_ttl)
+        if found:
+            self._remember(key, info, age)
+            if info is not None and age > self.store_ttl:
+                self.submit(dino_name)  # serve the stored summary, refresh it for next time
+        return found, info
+
+    def _remember(self, key, info, age=0.0):
+        # A miss read back from the store only has the rest of its negative TTL left
+        ttl = self.ttl if info is not None else self.negative_ttl - age
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, info)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def store(self, dino_name, info):
+        """Record a fetch result in memory and, if configured, on disk"""
+        self._remember(cache_key(dino_name), info)
+        if self.store_backend is not None:
+            self.store_backend.put(cache_key(dino_name), info)
+
+    def _fetch_and_store(self, dino_name):
+        start = time.monotonic()
+        try:
+            info = self.fetch(dino_name)
+        except Exception as e:
+            # Transport errors are not cached: the next request retries
+            self.stats['errors'] += 1
+            if self.breaker is not None:
+                self.breaker.record(time.monotonic() - start, failed=True)
+            log.warning(f"Wikipedia lookup for '{dino_name}' failed: {str(e)}")
+            return None
+        else:
+            if self.breaker is not None:
+                self.breaker.record(time.monotonic() - start)
+            self.store(dino_name, info)
+            return info
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key(dino_name), None)
+
+    def submit(self, dino_name):
+        """Start (or join) the background fetch for a name and return its Future,
+        or None when the circuit breaker refuses upstream calls"""
+        key = cache_key(dino_name)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future
+            if self.breaker is not None and not self.breaker.allow():
+                self.stats['short_circuited'] += 1
+                return None
+            future = self._inflight[key] = self._executor.submit(self._fetch_and_store, dino_name)
+            return future
+
+    def begin(self, dino_name):
+        """Start a lookup without blocking: the info itself when cached, else the pending Future"""
+        if not dino_name.strip():
+            return fallback_info(dino_name)
+
+        found, info = self.cached(dino_name)
+        if found:
+            self.stats['hits'] += 1
+            return dict(info) if info is not None else fallback_info(dino_name)
+
+        self.stats['misses'] += 1
+        pending = self.submit(dino_name)
+        return pending if pending is not None else fallback_info(dino_name)
+
+    def finish(self, dino_name, pending, budget=None):
+        """Resolve what begin() returned, waiting at most the latency budget"""
+        if not isinstance(pending, Future):
+            return pending
+        try:
+            info = pending.result(timeout=self.budget if budget is None else budget)
+        except FutureTimeout:
+            self.stats['budget_exceeded'] += 1
+            info = None
+        return dict(info) if info is not None else fallback_info(dino_name)
+
+    def get(self, dino_name, budget=None):
+        """Species info for a name, never waiting on Wikipedia longer than the budget"""
+        return self.finish(dino_name, self.begin(dino_name), budget)
+
+    def get_many(self, dino_names, budget=None):
+        """Info for many names at once, keyed by the requested spelling.
+
+        Names are deduplicated on their cache key; cache hits resolve at once and
+        every miss is fetched concurrently on the bounded worker pool, all within
+        one shared latency budget. Each item carries its own elapsed_ms.
+        """
+        start = time.monotonic()
+        deadline = start + (self.budget if budget is None else budget)
+        done_at = {}
+
+        pending = {}
+        for dino_name in dino_names:
+            key = cache_key(dino_name)
+            if key in pending:
+                continue
+            pending[key] = (dino_name, self.begin(dino_name))
+            if isinstance(pending[key][1], Future):
+                pending[key][1].add_done_callback(lambda _, key=key: done_at.setdefault(key, time.monotonic()))
+
+        resolved = {}
+        for key, (dino_name, started) in pending.items():
+            info = self.finish(dino_name, started, max(0.0, deadline - time.monotonic()))
+            finished = done_at.get(key, time.monotonic()) if isinstance(started, Future) else start
+            info['elapsed_ms'] = round((finished - start) * 1000, 2)
+            resolved[key] = info
+
+        return {dino_name: dict(resolved[cache_key(dino_name)]) for dino_name in dino_names}
+
+
+def prefetch(lookup, names, workers=8, refresh=False):
+    """Fetch and persist info for many names with at most `workers` requests in flight.
+    Returns counts per outcome: fetched, missing, skipped (already stored), failed."""
+    stored = lookup.store_backend.keys(lookup.negative_ttl) if lookup.store_backend is not None and not refresh else set()
+    pending = sorted({cache_key(name) for name in names if name.strip()} - stored)
+    summary = {'fetched': 0, 'missing': 0, 'skipped': len({cache_key(n) for n in names if n.strip()} & stored), 'failed': 0}
+
+    def work(name):
+        try:
+            info = lookup.fetch(name)
+        except Exception as e:
+            log.warning(f"Prefetch of '{name}' failed: {str(e)}")
+            return 'failed'
+        lookup.store(name, info)
+        return 'fetched' if info is not None else 'missing'
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for outcome in pool.map(work, pending):
+            summary[outcome] += 1
+    return summary
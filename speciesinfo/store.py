@@ -0,0 +1,127 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+log = logging.getLogger("speciesinfo")
+
+STORE_PATH = 'species_info.sqlite3'  # written at runtime, not committed
+# Built by `flask --app nuclear warm-species-cache` and committed, so every deploy
+# (including read-only, cold-starting ones) ships with it
+SEED_PATH = 'speciesinfo/species_info.seed.sqlite3'
+
+FIELDS = ['name', 'description', 'image_url', 'wiki_url', 'source']
+
+MAX_ROWS = 20000
+
+
+class SpeciesInfoStore:
+    """Persistent species info keyed by cleaned name, surviving restarts and cold starts.
+
+    A row with found=0 records that Wikipedia has no usable summary, so the
+    fallback is served without asking again until the row is older than the
+    caller's miss_max_age. Summaries are served whatever their age; the
+    caller decides when to refresh them. The table is capped at max_rows:
+    past that, misses go first, then the oldest summaries.
+
+    `seed` is a read-only store consulted after this one: the committed file
+    built by warm-species-cache. Its misses are build-time answers and do not
+    expire. Writes are best effort, so a read-only deploy still serves both.
+    """
+
+    def __init__(self, path=STORE_PATH, seed=None, max_rows=MAX_ROWS):
+        self.path = path
+        self.seed = seed
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS species_info ("
+                    "key TEXT PRIMARY KEY, found INTEGER NOT NULL, "
+                    "name TEXT, description TEXT, image_url TEXT, wiki_url TEXT, source TEXT, "
+                    "fetched_at REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS species_info_age ON species_info (found, fetched_at)"
+                )
+                self._conn.commit()
+            except sqlite3.OperationalError as e:
+                log.warning(f"Species info store {self.path} is read-only: {str(e)}")
+        return self._conn
+
+    def get(self, key, miss_max_age=None):
+        """(found, info, age in seconds) where info is None for a recorded miss.
+        Misses older than miss_max_age are not found."""
+        found, info, age = self._get(key, miss_max_age)
+        if not found and self.seed is not None:
+            found, info, age = self.seed.get(key)
+            if found and info is None:
+                age = 0.0  # shipped misses stay valid until the seed is rebuilt
+        return found, info, age
+
+    def _get(self, key, miss_max_age):
+        if self._conn is None and not os.path.exists(self.path):
+            return False, None, None
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT found, name, description, image_url, wiki_url, source, fetched_at "
+                    "FROM species_info WHERE key = ?",
+                    (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                log.warning(f"Species info store read failed: {str(e)}")
+                return False, None, None
+        if row is None:
+            return False, None, None
+        age = max(0.0, time.time() - row[-1])
+        if not row[0]:
+            if miss_max_age is not None and age > miss_max_age:
+                return False, None, None
+            return True, None, age
+        return True, dict(zip(FIELDS, row[1:-1])), age
+
+    def put(self, key, info):
+        values = [info.get(field, '') for field in FIELDS] if info is not None else [None] * len(FIELDS)
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO species_info "
+                    "(key, found, name, description, image_url, wiki_url, source, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [key, int(info is not None)] + values + [time.time()]
+                )
+                self._prune(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                log.warning(f"Species info store write failed: {str(e)}")
+
+    def _prune(self, conn):
+        # Keep at most max_rows: recorded misses are dropped before summaries, oldest first
+        (rows,) = conn.execute("SELECT COUNT(*) FROM species_info").fetchone()
+        if rows > self.max_rows:
+            conn.execute(
+                "DELETE FROM species_info WHERE key IN "
+                "(SELECT key FROM species_info ORDER BY found, fetched_at LIMIT ?)",
+                (rows - self.max_rows,)
+            )
+
+    def keys(self, miss_max_age=None):
+        """Keys of the rows that get() would still return"""
+        fresh = self.seed.keys() if self.seed is not None else set()
+        if self._conn is None and not os.path.exists(self.path):
+            return fresh
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute("SELECT key, found, fetched_at FROM species_info").fetchall()
+        for key, found, fetched_at in rows:
+            if found or miss_max_age is None or now - fetched_at <= miss_max_age:
+                fresh.add(key)
+        return fresh
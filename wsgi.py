@@ -0,0 +1,23 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets preload_app, so this module is imported once in the
+master process: warm_up() builds the dataset, indexes, geometry and model
+there and every forked worker shares those pages copy-on-write. `/ready`
+reports 200 once warmup has finished.
+
+Run `flask --app nuclear build-fossil-cache` and `flask --app nuclear
+build-assets` as part of the deploy, so the dataset loads from its columnar
+cache and the map page gets hashed, pre-compressed static files. Species info
+ships in speciesinfo/species_info.seed.sqlite3: rebuild it with `flask --app
+nuclear warm-species-cache` (needs network) and commit it.
+"""
+import gc
+from nuclear import app, warm_up
+
+warm_up()
+
+# Move everything loaded so far out of the collector's generations, so GC passes in
+# the workers don't write to (and un-share) the warmed-up objects
+gc.freeze()